@@ -0,0 +1,212 @@
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PIX2M, SAMPLE_TIME
+
+
+class RoombaBatch(object):
+    """
+    Represents many roomba cleaning robots, each one in its own rectangular room. The poses, velocities and bumper
+    states of all robots are stored as numpy arrays, so they are updated by array-wide operations.
+    """
+    def __init__(self, x, y, rotation, max_linear_speed, max_angular_speed, radius, room_width=None,
+                 room_height=None):
+        """
+        Creates a batch of roomba cleaning robots.
+
+        :param x: x coordinate of each robot.
+        :type x: numpy array.
+        :param y: y coordinate of each robot.
+        :type y: numpy array.
+        :param rotation: rotation of each robot.
+        :type rotation: numpy array.
+        :param max_linear_speed: the robots' maximum linear speed (a float or one per robot).
+        :type max_linear_speed: float or numpy array.
+        :param max_angular_speed: the robots' maximum angular speed (a float or one per robot).
+        :type max_angular_speed: float or numpy array.
+        :param radius: the robots' radius (a float or one per robot).
+        :type radius: float or numpy array.
+        :param room_width: width of the room of each robot (by default, the width of the screen).
+        :type room_width: float or numpy array.
+        :param room_height: height of the room of each robot (by default, the height of the screen).
+        :type room_height: float or numpy array.
+        """
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.rotation = np.array(rotation, dtype=np.float64)
+        self.size = np.size(self.x)
+        self.linear_speed = np.zeros(self.size)
+        self.angular_speed = np.zeros(self.size)
+        self.max_linear_speed = np.broadcast_to(np.asarray(max_linear_speed, dtype=np.float64), (self.size,))
+        self.max_angular_speed = np.broadcast_to(np.asarray(max_angular_speed, dtype=np.float64), (self.size,))
+        self.radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (self.size,))
+        if room_width is None:
+            room_width = SCREEN_WIDTH * PIX2M
+        if room_height is None:
+            room_height = SCREEN_HEIGHT * PIX2M
+        self.room_width = np.broadcast_to(np.asarray(room_width, dtype=np.float64), (self.size,))
+        self.room_height = np.broadcast_to(np.asarray(room_height, dtype=np.float64), (self.size,))
+        self.bumper_state = np.zeros(self.size, dtype=bool)
+
+    def set_velocity(self, linear_speed, angular_speed):
+        """
+        Sets the robots' velocities.
+
+        :param linear_speed: the robots' linear speed (a float or one per robot).
+        :type linear_speed: float or numpy array.
+        :param angular_speed: the robots' angular speed (a float or one per robot).
+        :type angular_speed: float or numpy array.
+        """
+        np.clip(linear_speed, -self.max_linear_speed, self.max_linear_speed, out=self.linear_speed)
+        np.clip(angular_speed, -self.max_angular_speed, self.max_angular_speed, out=self.angular_speed)
+
+    def set_bumper_state(self, bumper_state):
+        """
+        Sets the bumper states.
+
+        :param bumper_state: if the bumper of each robot has detected an obstacle.
+        :type bumper_state: numpy array of bool.
+        """
+        self.bumper_state[:] = bumper_state
+
+    def get_bumper_state(self):
+        """
+        Obtains the bumper states.
+
+        :return: the bumper state of each robot.
+        :rtype: numpy array of bool.
+        """
+        return self.bumper_state
+
+    def move(self):
+        """
+        Moves the robots during one time step, with the same equations as Roomba.move().
+        """
+        dt = SAMPLE_TIME
+        v = self.linear_speed
+        w = self.angular_speed
+        heading = self.rotation + w * dt / 2.0
+        # Where the angular speed is too low, the complete movement equation fails due to a division by zero, so the
+        # limit when the angular speed is close to zero is used instead
+        straight = np.abs(w) < 1.0e-3
+        distance = np.where(straight, v * dt, 2.0 * v / np.where(straight, 1.0, w) * np.sin(w * dt / 2.0))
+        self.x += distance * np.cos(heading)
+        self.y += distance * np.sin(heading)
+        self.rotation += w * dt
+
+    def check_collision(self):
+        """
+        Checks collision between the robots and the walls of their rooms, with the same rules as
+        Simulation.check_collision(), and moves the robots which hit a wall back inside their rooms.
+
+        :return: the bumper state of each robot (if a collision has been detected).
+        :rtype: numpy array of bool.
+        """
+        radius = self.radius
+        left = self.x - radius <= 0.0
+        right = self.x + radius >= self.room_width
+        top = self.y - radius <= 0.0
+        bottom = self.y + radius >= self.room_height
+        # The right and bottom walls are tested last, so they win in rooms narrower than the robot, as in Simulation
+        np.copyto(self.x, radius, where=left)
+        np.copyto(self.x, self.room_width - radius, where=right)
+        np.copyto(self.y, radius, where=top)
+        np.copyto(self.y, self.room_height - radius, where=bottom)
+        return left | right | top | bottom
+
+
+class RobotView(object):
+    """
+    Represents one robot of a batch with the interface of Roomba, so the scalar behaviors (finite state machines and
+    behavior trees) can drive it.
+    """
+    def __init__(self, robots, index):
+        """
+        Creates a view of a robot.
+
+        :param robots: the batch of robots.
+        :type robots: RoombaBatch
+        :param index: index of the robot in the batch.
+        :type index: int
+        """
+        self.robots = robots
+        self.index = index
+
+    def set_velocity(self, linear_speed, angular_speed):
+        """
+        Sets the robot's velocity.
+
+        :param linear_speed: the robot's linear speed.
+        :type linear_speed: float
+        :param angular_speed: the robot's angular speed.
+        :type angular_speed: float
+        """
+        robots = self.robots
+        index = self.index
+        max_linear_speed = robots.max_linear_speed[index]
+        max_angular_speed = robots.max_angular_speed[index]
+        robots.linear_speed[index] = min(max(linear_speed, -max_linear_speed), max_linear_speed)
+        robots.angular_speed[index] = min(max(angular_speed, -max_angular_speed), max_angular_speed)
+
+    def get_bumper_state(self):
+        """
+        Obtains the bumper state.
+
+        :return: the bumper state.
+        :rtype: bool
+        """
+        return bool(self.robots.bumper_state[self.index])
+
+
+class ScalarBehaviors(object):
+    """
+    Represents the vectorized interface over one scalar behavior per robot. It is as slow as updating each robot by
+    itself, so it is meant for behaviors which have no vectorized implementation yet.
+    """
+    def __init__(self, behaviors):
+        """
+        Creates the vectorized interface.
+
+        :param behaviors: the behavior of each robot (finite state machine or behavior tree).
+        :type behaviors: list
+        """
+        self.behaviors = behaviors
+        self.views = None
+
+    def update(self, robots):
+        """
+        Updates the behavior of each robot.
+
+        :param robots: the batch of robots.
+        :type robots: RoombaBatch
+        """
+        if self.views is None or self.views[0].robots is not robots:
+            self.views = [RobotView(robots, index) for index in range(robots.size)]
+        for behavior, view in zip(self.behaviors, self.views):
+            behavior.update(view)
+
+
+class BatchSimulation(object):
+    """
+    Represents the simulation of a batch of robots, without drawing.
+    """
+    def __init__(self, robots, behavior):
+        """
+        Creates the simulation.
+
+        :param robots: the batch of robots used in this simulation.
+        :type robots: RoombaBatch
+        :param behavior: the vectorized behavior of the robots, which has a method update(robots).
+        """
+        self.robots = robots
+        self.behavior = behavior
+        self.steps = 0
+
+    def update(self):
+        """
+        Updates the simulation, in the same order as Simulation.update().
+        """
+        # Verifying collision
+        self.robots.set_bumper_state(self.robots.check_collision())
+        # Updating the robots' behavior and movement
+        self.behavior.update(self.robots)
+        self.robots.move()
+        self.steps += 1
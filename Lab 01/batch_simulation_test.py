@@ -0,0 +1,24 @@
+import time
+import numpy as np
+from constants import *
+from batch_simulation import RoombaBatch, BatchSimulation
+from batch_state_machine import VectorizedStateMachine
+
+NUM_ROBOTS = 10000
+SIMULATED_TIME = 60.0  # simulated time in seconds
+
+# Every robot starts at the center of its own room, with a different orientation
+rng = np.random.default_rng(0)
+x = np.full(NUM_ROBOTS, PIX2M * SCREEN_WIDTH / 2.0)
+y = np.full(NUM_ROBOTS, PIX2M * SCREEN_HEIGHT / 2.0)
+rotation = rng.uniform(-PI, PI, NUM_ROBOTS)
+robots = RoombaBatch(x, y, rotation, 1.0, 2.0, 0.34 / 2.0)
+simulation = BatchSimulation(robots, VectorizedStateMachine(NUM_ROBOTS, seed=0))
+
+num_steps = round(SIMULATED_TIME * FREQUENCY)
+tic = time.perf_counter()
+for step in range(num_steps):
+    simulation.update()
+toc = time.perf_counter()
+print(r'{0} robots, {1} steps in {2} s: {3} robot-steps per second'.format(
+    NUM_ROBOTS, num_steps, toc - tic, NUM_ROBOTS * num_steps / (toc - tic)))
@@ -0,0 +1,83 @@
+import numpy as np
+from constants import *
+
+# States of the roomba's finite state machine
+MOVE_FORWARD = 0
+MOVE_IN_SPIRAL = 1
+GO_BACK = 2
+ROTATE = 3
+
+
+class VectorizedStateMachine(object):
+    """
+    Represents the roomba's finite state machine (MoveForwardState, MoveInSpiralState, GoBackState and RotateState)
+    running on every robot of a batch at once. The state and the counter of each robot are stored as numpy arrays.
+    """
+    def __init__(self, size, seed=None):
+        """
+        Creates the state machines, all of them in the move forward state.
+
+        :param size: number of robots.
+        :type size: int
+        :param seed: seed of the random number generator of the rotation angles.
+        :type seed: int
+        """
+        self.state = np.full(size, MOVE_FORWARD, dtype=np.int8)
+        self.counter = np.zeros(size, dtype=np.int64)
+        self.rotate_angle = np.zeros(size)
+        self.rng = np.random.default_rng(seed)
+
+    def check_transition(self, robots):
+        """
+        Checks the transition conditions of every robot and executes the transitions, as each state's
+        check_transition() does. A state entered now starts with its counter at zero.
+
+        :param robots: the batch of robots.
+        :type robots: RoombaBatch
+        """
+        state = self.state
+        elapsed = self.counter * SAMPLE_TIME
+        collided = robots.get_bumper_state()
+        moving = (state == MOVE_FORWARD) | (state == MOVE_IN_SPIRAL)
+        to_go_back = moving & collided
+        to_spiral = (state == MOVE_FORWARD) & ~collided & (elapsed > MOVE_FORWARD_TIME)
+        to_rotate = (state == GO_BACK) & (elapsed > GO_BACK_TIME)
+        to_forward = ((state == MOVE_IN_SPIRAL) & ~collided & (elapsed > MOVE_IN_SPIRAL_TIME)) | \
+                     ((state == ROTATE) & (elapsed > np.abs(self.rotate_angle / ANGULAR_SPEED)))
+        state[to_go_back] = GO_BACK
+        state[to_spiral] = MOVE_IN_SPIRAL
+        state[to_rotate] = ROTATE
+        state[to_forward] = MOVE_FORWARD
+        self.counter[to_go_back | to_spiral | to_rotate | to_forward] = 0
+        num_rotations = np.count_nonzero(to_rotate)
+        if num_rotations > 0:
+            # Select a random value in [-π, π)
+            self.rotate_angle[to_rotate] = self.rng.uniform(-PI, PI - 1e-10, num_rotations)
+
+    def execute(self, robots):
+        """
+        Executes the logic of the current state of every robot.
+
+        :param robots: the batch of robots.
+        :type robots: RoombaBatch
+        """
+        state = self.state
+        # R(t) = Ro + b * t and w(t) = v / R(t) while moving in spiral
+        spiral_speed = FORWARD_SPEED / (INITIAL_RADIUS_SPIRAL + SPIRAL_FACTOR * (self.counter * SAMPLE_TIME))
+        linear_speed = np.where(state == GO_BACK, BACKWARD_SPEED, np.where(state == ROTATE, 0.0, FORWARD_SPEED))
+        angular_speed = np.where(state == MOVE_IN_SPIRAL, spiral_speed,
+                                 np.where(state == ROTATE, np.where(self.rotate_angle < 0, -ANGULAR_SPEED,
+                                                                    ANGULAR_SPEED), 0.0))
+        robots.set_velocity(linear_speed, angular_speed)
+        # incrementing the counter to calculate the elapsed time
+        self.counter += 1
+
+    def update(self, robots):
+        """
+        Updates the state machine of every robot.
+
+        :param robots: the batch of robots.
+        :type robots: RoombaBatch
+        """
+        self.check_transition(robots)
+        self.execute(robots)
@@ -0,0 +1,155 @@
+from behavior_tree import ExecutionStatus, SequenceNode, SelectorNode, CompositeNode
+
+# Operation codes of the nodes of a compiled tree
+SEQUENCE = 0
+SELECTOR = 1
+LEAF = 2
+
+# Status codes, which are the values of ExecutionStatus
+SUCCESS = ExecutionStatus.SUCCESS.value
+FAILURE = ExecutionStatus.FAILURE.value
+RUNNING = ExecutionStatus.RUNNING.value
+
+# Index of the root node of a compiled tree
+ROOT = 0
+
+
+class CompiledBehaviorTree(object):
+    """
+    Represents a behavior tree flattened into arrays indexed by node, in depth-first order: the operation code, parent,
+    first child and next sibling of each node, and the running child of each composite node. A tick is a loop over
+    these arrays instead of recursive execute() calls, so the only method calls are the ones to the leaves.
+    It ticks exactly as the original tree, whose leaves it keeps (the running child of the original composite nodes
+    is not updated anymore).
+    """
+    def __init__(self, tree):
+        """
+        Compiles a behavior tree.
+
+        :param tree: the behavior tree.
+        :type tree: BehaviorTree
+        """
+        self.operations = []
+        self.parents = []
+        self.first_children = []
+        self.next_siblings = []
+        # Bound enter() and execute() methods of the leaves (None for composite nodes)
+        self.enters = []
+        self.executes = []
+        if tree.root is not None:
+            self.compile(tree.root)
+        # Running child of each composite node (-1 if no child is running)
+        self.running_children = [-1] * len(self.operations)
+
+    def compile(self, root):
+        """
+        Fills the arrays with the nodes of a tree in depth-first order.
+
+        :param root: the root of the tree.
+        :type root: TreeNode
+        """
+        nodes = []
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            index = len(nodes)
+            nodes.append(node)
+            self.parents.append(parent)
+            if isinstance(node, CompositeNode):
+                if isinstance(node, SequenceNode):
+                    self.operations.append(SEQUENCE)
+                elif isinstance(node, SelectorNode):
+                    self.operations.append(SELECTOR)
+                else:
+                    raise ValueError('Unknown composite node: %s' % node.node_name)
+                if not node.children:
+                    raise ValueError('Composite node without children: %s' % node.node_name)
+                self.enters.append(None)
+                self.executes.append(None)
+                for child in reversed(node.children):
+                    stack.append((child, index))
+            else:
+                self.operations.append(LEAF)
+                self.enters.append(node.enter)
+                self.executes.append(node.execute)
+        # The children of each node only get their indices once their subtrees are traversed, so they are linked after
+        indices = {id(node): index for index, node in enumerate(nodes)}
+        self.first_children = [-1] * len(nodes)
+        self.next_siblings = [-1] * len(nodes)
+        for index, node in enumerate(nodes):
+            if isinstance(node, CompositeNode):
+                children = [indices[id(child)] for child in node.children]
+                self.first_children[index] = children[0]
+                for child, sibling in zip(children, children[1:]):
+                    self.next_siblings[child] = sibling
+
+    def enter(self, node, agent):
+        """
+        Enters a node: a composite node forgets its running child and a leaf runs its enter() method.
+
+        :param node: index of the node.
+        :type node: int
+        :param agent: the agent this tree is being executed on.
+        """
+        if self.operations[node] == LEAF:
+            self.enters[node](agent)
+        else:
+            self.running_children[node] = -1
+
+    def tick(self, agent):
+        """
+        Executes the tree once.
+
+        :param agent: the agent this tree is being executed on.
+        :return: the status code of the root.
+        :rtype: int
+        """
+        operations = self.operations
+        parents = self.parents
+        first_children = self.first_children
+        next_siblings = self.next_siblings
+        enters = self.enters
+        executes = self.executes
+        running_children = self.running_children
+        node = ROOT
+        while True:
+            # Descending through the running children down to a leaf, putting the first child to run where no
+            # child was running
+            while operations[node] != LEAF:
+                child = running_children[node]
+                if child < 0:
+                    child = first_children[node]
+                    running_children[node] = child
+                    if operations[child] == LEAF:
+                        enters[child](agent)
+                node = child
+            # _value_ is a plain attribute, unlike the value property of the enumeration
+            status = executes[node](agent)._value_
+            # Ascending with the status: a running child keeps every ancestor running, and a composite node only
+            # runs its next child if a sequence's child succeeded or a selector's child failed. Otherwise the
+            # composite node finishes with the same status as its child
+            while True:
+                if status == RUNNING or node == ROOT:
+                    return status
+                parent = parents[node]
+                if (operations[parent] == SEQUENCE) == (status == SUCCESS):
+                    sibling = next_siblings[node]
+                    if sibling >= 0:
+                        running_children[parent] = sibling
+                        if operations[sibling] == LEAF:
+                            enters[sibling](agent)
+                        else:
+                            running_children[sibling] = -1
+                        node = sibling
+                        break
+                running_children[parent] = -1
+                node = parent
+
+    def update(self, agent):
+        """
+        Updates the behavior tree, so it replaces BehaviorTree as a roomba's behavior.
+
+        :param agent: the agent this behavior tree is being executed on.
+        """
+        if self.operations:
+            self.tick(agent)
@@ -0,0 +1,159 @@
+from math import floor, ceil
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PIX2M, SAMPLE_TIME
+
+
+class CoverageGrid(object):
+    """
+    Represents the area covered by a robot as a grid of cells, where a cell is covered once its center has been
+    under the robot's disk. The disk swept by the robot is rasterized incrementally: when the robot's center moves to
+    a neighboring cell, only the cells on the leading edge of the disk are visited.
+    """
+    def __init__(self, radius, resolution=0.02, width=None, height=None, thresholds=(0.5, 0.75, 0.9)):
+        """
+        Creates an empty coverage grid.
+
+        :param radius: the robot's radius.
+        :type radius: float
+        :param resolution: side of each cell.
+        :type resolution: float
+        :param width: width of the room (by default, the width of the screen).
+        :type width: float
+        :param height: height of the room (by default, the height of the screen).
+        :type height: float
+        :param thresholds: coverage fractions whose time to be reached is recorded.
+        :type thresholds: tuple of float
+        """
+        if width is None:
+            width = SCREEN_WIDTH * PIX2M
+        if height is None:
+            height = SCREEN_HEIGHT * PIX2M
+        self.resolution = resolution
+        self.columns = ceil(width / resolution)
+        self.rows = ceil(height / resolution)
+        # The grid is padded, so the disk never leaves it and the offsets of its cells never wrap around a row
+        self.padding = ceil(radius / resolution) + 2
+        self.stride = self.columns + 2 * self.padding
+        # Cells under the disk when the robot's center is in the cell (0, 0)
+        cells = ceil(radius / resolution)
+        disk = [(i, j) for i in range(-cells, cells + 1) for j in range(-cells, cells + 1)
+                if (i * resolution) ** 2 + (j * resolution) ** 2 <= radius ** 2]
+        disk_set = set(disk)
+        # A cell is coverable if it is under the disk for some cell the robot's center can be in
+        centers = np.zeros((self.rows + 2 * self.padding, self.stride), dtype=bool)
+        centers[self.padding + floor(radius / resolution):self.padding + floor((height - radius) / resolution) + 1,
+                self.padding + floor(radius / resolution):self.padding + floor((width - radius) / resolution) + 1] = True
+        coverable = np.zeros(centers.shape, dtype=bool)
+        for i, j in disk:
+            coverable |= np.roll(centers, (i, j), axis=(0, 1))
+        room = np.zeros(centers.shape, dtype=bool)
+        room[self.padding:self.padding + self.rows, self.padding:self.padding + self.columns] = True
+        coverable &= room
+        self.num_coverable = int(np.count_nonzero(coverable))
+        # Padding and cells which can not be covered are marked as covered from the start, so they are never counted
+        self.covered = bytearray((~coverable).astype(np.uint8).tobytes())
+        # Flat offsets of the cells under the disk, and of the cells which enter it after a move to each neighbor
+        self.disk_offsets = [i * self.stride + j for i, j in disk]
+        self.edge_offsets = {}
+        for di in range(-1, 2):
+            for dj in range(-1, 2):
+                if di != 0 or dj != 0:
+                    self.edge_offsets[(di, dj)] = [i * self.stride + j for i, j in disk
+                                                   if (i + di, j + dj) not in disk_set]
+        self.thresholds = sorted(thresholds)
+        # Number of covered cells needed to reach each threshold
+        self.threshold_counts = [ceil(threshold * self.num_coverable) for threshold in self.thresholds]
+        self.threshold_times = {}
+        self.num_covered = 0
+        self.num_steps = 0
+        self.inverse_resolution = 1.0 / resolution
+        # Cell of the robot's center in the last update, before clamping it to the grid
+        self.i = None
+        self.j = None
+
+    def mark(self, index, offsets):
+        """
+        Marks the cells at some offsets from a cell as covered.
+
+        :param index: flat index of the cell.
+        :type index: int
+        :param offsets: flat offsets of the cells.
+        :type offsets: list of int
+        """
+        covered = self.covered
+        num_covered = self.num_covered
+        for offset in offsets:
+            if not covered[index + offset]:
+                covered[index + offset] = 1
+                num_covered += 1
+        if num_covered != self.num_covered:
+            self.num_covered = num_covered
+            while len(self.threshold_times) < len(self.thresholds) and \
+                    num_covered >= self.threshold_counts[len(self.threshold_times)]:
+                self.threshold_times[self.thresholds[len(self.threshold_times)]] = self.num_steps * SAMPLE_TIME
+
+    def update(self, x, y):
+        """
+        Updates the coverage after a time step, with the robot at a given position.
+
+        :param x: x coordinate of the robot.
+        :type x: float
+        :param y: y coordinate of the robot.
+        :type y: float
+        """
+        self.num_steps += 1
+        # Truncating is flooring inside the room, and positions slightly outside it are clamped below anyway
+        i = int(y * self.inverse_resolution)
+        j = int(x * self.inverse_resolution)
+        if i == self.i and j == self.j:
+            # The disk is rasterized at cell resolution, so it only changes when the center moves to another cell
+            return
+        pi = None if self.i is None else min(max(self.i, 0), self.rows - 1)
+        pj = None if self.j is None else min(max(self.j, 0), self.columns - 1)
+        self.i = i
+        self.j = j
+        i = min(max(i, 0), self.rows - 1)
+        j = min(max(j, 0), self.columns - 1)
+        if pi is None:
+            self.mark((i + self.padding) * self.stride + j + self.padding, self.disk_offsets)
+            return
+        # Walks from the previous cell to the new one through neighboring cells, so a long step still covers
+        # the whole swept area
+        while pi != i or pj != j:
+            di = (i > pi) - (i < pi)
+            dj = (j > pj) - (j < pj)
+            pi += di
+            pj += dj
+            self.mark((pi + self.padding) * self.stride + pj + self.padding, self.edge_offsets[(di, dj)])
+
+    def get_coverage(self):
+        """
+        Obtains the fraction of the coverable cells which were covered.
+
+        :return: the coverage fraction.
+        :rtype: float
+        """
+        return self.num_covered / self.num_coverable
+
+    def get_time_to_coverage(self, threshold):
+        """
+        Obtains the simulated time when the coverage reached one of the thresholds.
+
+        :param threshold: one of the thresholds given to the constructor.
+        :type threshold: float
+        :return: the time in seconds (None if the coverage has not reached the threshold yet).
+        :rtype: float
+        """
+        if threshold not in self.thresholds:
+            raise ValueError('The time to %g coverage is not recorded' % threshold)
+        return self.threshold_times.get(threshold)
+
+    def get_grid(self):
+        """
+        Obtains the covered cells, without the padding.
+
+        :return: if each cell was covered (cells which can not be covered are also marked).
+        :rtype: numpy array of bool with shape (rows, columns).
+        """
+        covered = np.frombuffer(bytes(self.covered), dtype=np.uint8).reshape(-1, self.stride)
+        return covered[self.padding:self.padding + self.rows, self.padding:self.padding + self.columns] != 0
@@ -0,0 +1,110 @@
+import argparse
+import random
+import time
+from utils import Pose
+from constants import *
+from roomba import Roomba
+from simulation import Simulation
+from coverage import CoverageGrid
+from state_machine import FiniteStateMachine, MoveForwardState
+from behavior_tree import RoombaBehaviorTree
+
+BEHAVIORS = {'behavior_tree': RoombaBehaviorTree, 'state_machine': lambda: FiniteStateMachine(MoveForwardState())}
+
+
+def create_simulation(behavior, coverage=False):
+    """
+    Creates the simulation of a roomba in the same way as the test scripts.
+
+    :param behavior: the roomba's behavior (finite state machine or behavior tree).
+    :param coverage: if the area covered by the roomba is measured.
+    :type coverage: bool
+    :return: the simulation.
+    :rtype: Simulation
+    """
+    pose = Pose(PIX2M * SCREEN_WIDTH / 2.0, PIX2M * SCREEN_HEIGHT / 2.0, 0.0)
+    roomba = Roomba(pose, 1.0, 2.0, 0.34 / 2.0, behavior)
+    return Simulation(roomba, CoverageGrid(roomba.radius) if coverage else None)
+
+
+def save_snapshot(simulation, filename):
+    """
+    Renders the simulation to an off-screen surface and saves it as an image, without opening a window.
+
+    :param simulation: the simulation object.
+    :type simulation: Simulation
+    :param filename: name of the image file.
+    :type filename: str
+    """
+    # pygame is only imported when a snapshot is requested
+    import pygame
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    surface.fill((224, 255, 255))
+    simulation.draw(surface)
+    pygame.image.save(surface, filename)
+
+
+def run(behavior, duration, seed, snapshot_times=(), snapshot_prefix='snapshot', coverage=False):
+    """
+    Steps the simulation as fast as possible during a simulated duration.
+
+    :param behavior: the roomba's behavior (finite state machine or behavior tree).
+    :param duration: simulated duration in seconds.
+    :type duration: float
+    :param seed: seed of the random number generator used by the behaviors.
+    :type seed: int
+    :param snapshot_times: simulated times, in seconds, when a snapshot is saved.
+    :type snapshot_times: list of float
+    :param snapshot_prefix: prefix of the names of the snapshot files, which end with the simulated time.
+    :type snapshot_prefix: str
+    :param coverage: if the area covered by the roomba is measured.
+    :type coverage: bool
+    :return: the simulation, the wall time spent stepping it and the names of the snapshot files.
+    :rtype: Simulation, float and list of str
+    """
+    random.seed(seed)
+    simulation = create_simulation(behavior, coverage)
+    num_steps = round(duration * FREQUENCY)
+    # Steps after which each snapshot is taken
+    snapshot_steps = sorted((round(t * FREQUENCY), t) for t in snapshot_times if 0.0 <= t <= duration)
+    filenames = []
+    wall_time = 0.0
+    step = 0
+    for snapshot_step, snapshot_time in snapshot_steps + [(num_steps, None)]:
+        tic = time.perf_counter()
+        while step < snapshot_step:
+            simulation.update()
+            step += 1
+        wall_time += time.perf_counter() - tic
+        if snapshot_time is not None:
+            filename = '%s_%gs.png' % (snapshot_prefix, snapshot_time)
+            save_snapshot(simulation, filename)
+            filenames.append(filename)
+    return simulation, wall_time, filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless faster-than-realtime simulation of the roomba.')
+    parser.add_argument('--behavior', default='behavior_tree', choices=list(BEHAVIORS))
+    parser.add_argument('--duration', type=float, default=3600.0, help='simulated duration in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--snapshots', type=float, nargs='*', default=[],
+                        help='simulated times, in seconds, when a snapshot is saved')
+    parser.add_argument('--snapshot-prefix', default='snapshot')
+    parser.add_argument('--coverage', action='store_true', help='measures the area covered by the roomba')
+    args = parser.parse_args()
+
+    simulation, wall_time, filenames = run(BEHAVIORS[args.behavior](), args.duration, args.seed, args.snapshots,
+                                           args.snapshot_prefix, args.coverage)
+    print(r'{0}: {1} simulated seconds in {2} s: {3} simulated seconds per wall second'.format(
+        args.behavior, args.duration, wall_time, args.duration / wall_time))
+    if simulation.coverage is not None:
+        print(r'Coverage: {0}'.format(simulation.coverage.get_coverage()))
+        for threshold in simulation.coverage.thresholds:
+            print(r'Time to {0} coverage: {1} s'.format(threshold, simulation.coverage.get_time_to_coverage(threshold)))
+    for filename in filenames:
+        print(r'Snapshot saved in {0}'.format(filename))
+
+
+if __name__ == '__main__':
+    main()
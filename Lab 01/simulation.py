@@ -1,4 +1,3 @@
-import pygame
 from math import sin, cos
 from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PIX2M, M2PIX
 
@@ -7,15 +6,18 @@ class Simulation(object):
     """
     Represents the simulation.
     """
-    def __init__(self, roomba):
+    def __init__(self, roomba, coverage=None):
         """
         Creates the simulation.
 
         :param roomba: the roomba robot used in this simulation.
         :type roomba: Roomba
+        :param coverage: optional coverage grid updated with the roomba's position at each step.
+        :type coverage: CoverageGrid
         """
         self.point_list = []
         self.roomba = roomba
+        self.coverage = coverage
 
     def check_collision(self):
         """
@@ -61,6 +63,8 @@ class Simulation(object):
         self.roomba.set_bumper_state(bumper_state)
         # Updating the robot's behavior and movement
         self.roomba.update()
+        if self.coverage is not None:
+            self.coverage.update(self.roomba.pose.position.x, self.roomba.pose.position.y)
 
     def draw(self, window):
         """
@@ -68,6 +72,8 @@ class Simulation(object):
 
         :param window: pygame's window where the drawing will occur.
         """
+        # pygame is only imported when drawing, so the simulation can run headless without it
+        import pygame
         # If we have less than 2 points, we are unable to plot the movement history
         if len(self.point_list) >= 2:
             pygame.draw.lines(window, (255, 0, 0), False, self.point_list, 4)
@@ -92,6 +98,7 @@ def draw(simulation, window):
     :param simulation: the simulation object.
     :param window: pygame's window where the drawing will occur.
     """
+    import pygame
     window.fill((224, 255, 255))
     simulation.draw(window)
     pygame.display.update()
@@ -1,3 +1,4 @@
+import pygame
 from utils import Pose
 from constants import FREQUENCY
 from roomba import Roomba
@@ -0,0 +1,179 @@
+from grid import SearchState
+from math import inf, sqrt
+import heapq
+import time
+
+# Number of expansions between two checks of the clock
+CLOCK_CHECK_INTERVAL = 64
+
+
+class AnytimePlanner(object):
+    """
+    Represents an anytime path planner based on Anytime Repairing A* (ARA*). A first path is found quickly using
+    an inflated heuristic, then the inflation is decreased and the path improved, reusing the previous search
+    effort, until the time budget runs out or the path is proved optimal. The deadline is only exceeded by the
+    expansions between two checks of the clock and by the bookkeeping of the last path found. If the first search
+    has not found a path by then, the planner reports it instead of a path (a larger initial inflation factor finds
+    the first path sooner).
+    """
+    def __init__(self, cost_map, initial_epsilon=3.0, epsilon_step=0.5):
+        """
+        Creates an anytime path planner for a given cost map.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        :param initial_epsilon: inflation factor of the heuristic in the first search.
+        :type initial_epsilon: float.
+        :param epsilon_step: how much the inflation factor is decreased after each search.
+        :type epsilon_step: float.
+        """
+        self.cost_map = cost_map
+        self.initial_epsilon = initial_epsilon
+        self.epsilon_step = epsilon_step
+        self.state = SearchState(cost_map)
+
+    def solutions(self, start_position, goal_position, time_budget):
+        """
+        Plans paths of increasing quality until the time budget runs out. Only improvements are yielded: a path
+        cheaper than the best one so far, or a tighter bound of its cost. The time spent building the graph of the
+        cost map and its connected components is not counted in the budget.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :param time_budget: time available for planning, in seconds.
+        :type time_budget: float.
+        :return: generator of (path, cost, bound), where bound is the suboptimality bound of the cost. The path is
+            empty if the goal can not be reached, and None if no path was found within the time budget.
+        :rtype: generator of tuples.
+        """
+        graph = self.cost_map.get_graph()
+        state = self.state
+        state.reset()
+        if not self.cost_map.is_reachable(start_position, goal_position):
+            yield [], inf, inf
+            return
+        deadline = time.perf_counter() + time_budget
+        g = state.g
+        parent = state.parent
+        stamp = state.stamp
+        generation = state.generation
+        width = state.width
+        offsets = graph.offsets
+        neighbors = graph.neighbors
+        costs = graph.costs
+        goal_i, goal_j = goal_position
+        start = state.get_index(start_position[0], start_position[1])
+        goal = state.get_index(goal_i, goal_j)
+
+        def heuristic(index):
+            i, j = divmod(index, width)
+            return sqrt((i - goal_i) ** 2 + (j - goal_j) ** 2)
+
+        def get_g(index):
+            return g[index] if stamp[index] == generation else inf
+
+        epsilon = self.initial_epsilon
+        stamp[start] = generation
+        g[start] = 0.0
+        parent[start] = -1
+        # OPEN maps each open cell to its key, and the heap may hold outdated entries of it
+        open_keys = {start: epsilon * heuristic(start)}
+        pq = [(open_keys[start], start)]
+        # Cells improved after being closed in the current search, which wait for the next one
+        inconsistent = set()
+        best_path = None
+        best_cost = inf
+        best_bound = inf
+        while True:
+            closed = set()
+            expansions = 0
+            timed_out = False
+            # Improving the path while the goal may still be reached through a cell of OPEN with a smaller key
+            while pq:
+                key, current = pq[0]
+                if open_keys.get(current) != key:
+                    heapq.heappop(pq)
+                    continue
+                if key >= get_g(goal):
+                    break
+                expansions += 1
+                if expansions % CLOCK_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+                    timed_out = True
+                    break
+                heapq.heappop(pq)
+                del open_keys[current]
+                closed.add(current)
+                current_g = float(g[current])
+                begin = offsets[current]
+                end = offsets[current + 1]
+                for successor, edge_cost in zip(neighbors[begin:end].tolist(), costs[begin:end].tolist()):
+                    new_g = current_g + edge_cost
+                    if new_g < get_g(successor):
+                        stamp[successor] = generation
+                        g[successor] = new_g
+                        parent[successor] = current
+                        if successor in closed:
+                            inconsistent.add(successor)
+                        else:
+                            open_keys[successor] = new_g + epsilon * heuristic(successor)
+                            heapq.heappush(pq, (open_keys[successor], successor))
+            if timed_out:
+                if best_path is None:
+                    # The budget ran out before the first path was found
+                    yield None, inf, inf
+                return
+            cost = get_g(goal)
+            if cost == inf:
+                # There is no path to the goal
+                yield [], inf, inf
+                return
+            # The optimal cost is at least the smallest g + h of the cells which may still improve the path
+            candidates = list(open_keys) + list(inconsistent)
+            lower_bound = min([get_g(index) + heuristic(index) for index in candidates] + [cost])
+            # Cells improved after being closed may already shorten the path, so its cost may be less than g(goal)
+            path = state.construct_path(goal)
+            path_cost = float(sum([self.cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)]))
+            improved = path_cost < best_cost
+            if improved:
+                best_path = path
+                best_cost = path_cost
+            # The best path costs at most g(goal), which is at most epsilon times the optimal cost
+            bound = float(min(epsilon, best_cost / lower_bound)) if lower_bound > 0.0 else 1.0
+            if bound < best_bound:
+                best_bound = bound
+                improved = True
+            if improved:
+                yield best_path, best_cost, best_bound
+            if best_bound <= 1.0 or time.perf_counter() > deadline:
+                return
+            # Preparing the next search with a smaller inflation factor
+            epsilon = max(1.0, epsilon - self.epsilon_step)
+            for index in inconsistent:
+                open_keys[index] = 0.0
+            inconsistent = set()
+            for index in open_keys:
+                open_keys[index] = get_g(index) + epsilon * heuristic(index)
+            pq = [(key, index) for index, key in open_keys.items()]
+            heapq.heapify(pq)
+
+    def plan(self, start_position, goal_position, time_budget):
+        """
+        Plans the best path that can be found within a time budget.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :param time_budget: time available for planning, in seconds.
+        :type time_budget: float.
+        :return: the best path as a sequence of positions, the path cost and its suboptimality bound
+            (the path cost is at most bound times the optimal cost). The path is empty if the goal can not be
+            reached, and None if no path was found within the time budget.
+        :rtype: list of tuples, float and float.
+        """
+        path, cost, bound = [], inf, inf
+        for path, cost, bound in self.solutions(start_position, goal_position, time_budget):
+            pass
+        return path, cost, bound
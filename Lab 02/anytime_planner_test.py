@@ -0,0 +1,40 @@
+import math
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+from anytime_planner import AnytimePlanner
+
+NUM_MAPS = 3
+NUM_PROBLEMS = 10  # problems of each map
+TIME_BUDGET = 60.0  # large enough for the searches to prove the last path optimal
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+
+num_solutions = 0
+num_problems = 0
+for seed in range(NUM_MAPS):
+    cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+    path_planner = PathPlanner(cost_map)
+    planner = AnytimePlanner(cost_map)
+    for start_position, goal_position in create_problems(cost_map, NUM_PROBLEMS, seed):
+        expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+        best_cost = math.inf
+        best_bound = math.inf
+        for path, cost, bound in planner.solutions(start_position, goal_position, TIME_BUDGET):
+            if expected_cost == math.inf:
+                assert not path and cost == math.inf, (start_position, goal_position, cost)
+                continue
+            assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+            path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)])
+            assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (path_cost, cost)
+            # Only improvements are yielded, and the bound holds
+            assert cost < best_cost or bound < best_bound, (cost, best_cost, bound, best_bound)
+            assert cost <= bound * expected_cost * (1.0 + COST_TOLERANCE), (cost, bound, expected_cost)
+            best_cost = min(best_cost, cost)
+            best_bound = min(best_bound, bound)
+            num_solutions += 1
+        path, cost, bound = planner.plan(start_position, goal_position, TIME_BUDGET)
+        assert math.isclose(cost, expected_cost, rel_tol=COST_TOLERANCE), (start_position, goal_position, cost,
+                                                                          expected_cost)
+        assert expected_cost == math.inf or bound == 1.0, bound
+        num_problems += 1
+print(r'ARA* found {0} improving paths and the optimal one in {1} problems'.format(num_solutions, num_problems))
@@ -0,0 +1,199 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import random
+import time
+import numpy as np
+from math import inf
+from grid import CostMap
+from path_planner import PathPlanner
+from open_list import OPEN_LISTS
+
+ALGORITHMS = ['dijkstra', 'greedy', 'a_star', 'bidirectional_dijkstra', 'bidirectional_a_star']
+
+# Path planner of each worker process, created once by initialize_worker()
+path_planner = None
+
+
+def create_cost_map(width, height, obstacle_width, obstacle_height, num_obstacles, seed):
+    """
+    Creates a random cost map in the same way as main.py.
+
+    :param width: width (number of columns) of the cost map.
+    :type width: int.
+    :param height: height (number of rows) of the cost map.
+    :type height: int.
+    :param obstacle_width: width (number of columns) of each obstacle.
+    :type obstacle_width: int.
+    :param obstacle_height: height (number of rows) of each obstacle.
+    :type obstacle_height: int.
+    :param num_obstacles: number of obstacles.
+    :type num_obstacles: int.
+    :param seed: seed of the random number generator.
+    :type seed: int.
+    :return: the cost map.
+    :rtype: CostMap.
+    """
+    cost_map = CostMap(width, height)
+    random.seed(seed)
+    cost_map.create_random_map(obstacle_width, obstacle_height, num_obstacles)
+    return cost_map
+
+
+def create_problems(cost_map, num_problems, seed):
+    """
+    Samples planning problems whose start and goal are distinct free cells.
+
+    :param cost_map: cost map used for planning.
+    :type cost_map: CostMap.
+    :param num_problems: number of problems.
+    :type num_problems: int.
+    :param seed: seed of the random number generator.
+    :type seed: int.
+    :return: list of (start, goal) positions.
+    :rtype: list of tuples.
+    """
+    rng = random.Random(seed)
+    problems = []
+    while len(problems) < num_problems:
+        start_position = (rng.randint(0, cost_map.height - 1), rng.randint(0, cost_map.width - 1))
+        goal_position = (rng.randint(0, cost_map.height - 1), rng.randint(0, cost_map.width - 1))
+        if cost_map.is_occupied(start_position[0], start_position[1]):
+            continue
+        if cost_map.is_occupied(goal_position[0], goal_position[1]):
+            continue
+        if start_position == goal_position:
+            continue
+        problems.append((start_position, goal_position))
+    return problems
+
+
+def initialize_worker(cost_map):
+    """
+    Creates the path planner of a worker process. The cost map is received once per worker and only read afterwards.
+
+    :param cost_map: cost map used for planning.
+    :type cost_map: CostMap.
+    """
+    global path_planner
+    path_planner = PathPlanner(cost_map)
+
+
+def run_query(query):
+    """
+    Solves a planning problem with a given algorithm and measures it.
+
+    :param query: the query as (query number, algorithm, open list, start position, goal position).
+    :type query: tuple.
+    :return: measurements of the query.
+    :rtype: dict.
+    """
+    number, algorithm, open_list, start_position, goal_position = query
+    tic = time.perf_counter()
+    path, cost = getattr(path_planner, algorithm)(start_position, goal_position, open_list)
+    toc = time.perf_counter()
+    # Every expansion closes exactly one cell of the search state (or of one of the two bidirectional states)
+    states = [path_planner.node_grid]
+    if algorithm.startswith('bidirectional'):
+        states.append(path_planner.backward_state)
+    expansions = sum([state.count_closed() for state in states])
+    return {'query': number, 'algorithm': algorithm, 'open_list': open_list, 'start': list(start_position),
+            'goal': list(goal_position), 'time': toc - tic, 'expansions': expansions,
+            'cost': cost if cost != inf else None, 'path_length': len(path)}
+
+
+def summarize(results):
+    """
+    Computes statistics of the measurements of each algorithm and open list.
+
+    :param results: measurements of the queries.
+    :type results: list of dict.
+    :return: statistics of each algorithm and open list, indexed by '<algorithm>/<open list>'.
+    :rtype: dict.
+    """
+    summary = {}
+    for name in sorted(set('%s/%s' % (result['algorithm'], result['open_list']) for result in results)):
+        selected = [result for result in results if '%s/%s' % (result['algorithm'], result['open_list']) == name]
+        times = np.array([result['time'] for result in selected])
+        expansions = np.array([result['expansions'] for result in selected])
+        costs = np.array([result['cost'] for result in selected if result['cost'] is not None])
+        summary[name] = {'queries': int(np.size(times)), 'time_mean': float(np.mean(times)),
+                         'time_std': float(np.std(times)), 'time_median': float(np.median(times)),
+                         'expansions_mean': float(np.mean(expansions)),
+                         'cost_mean': float(np.mean(costs)) if np.size(costs) > 0 else None,
+                         'unreachable': int(np.size(times) - np.size(costs))}
+    return summary
+
+
+def write_report(filename, parameters, summary, results):
+    """
+    Writes the report as JSON (parameters, summary and every query) or as CSV (one row per query).
+
+    :param filename: name of the report file, whose extension (.json or .csv) selects the format.
+    :type filename: str.
+    :param parameters: parameters of the benchmark.
+    :type parameters: dict.
+    :param summary: statistics of each algorithm and open list.
+    :type summary: dict.
+    :param results: measurements of the queries.
+    :type results: list of dict.
+    """
+    if filename.endswith('.csv'):
+        with open(filename, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(filename, 'w') as file:
+            json.dump({'parameters': parameters, 'summary': summary, 'queries': results}, file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless Monte Carlo benchmark of the path planners.')
+    parser.add_argument('--width', type=int, default=160)
+    parser.add_argument('--height', type=int, default=120)
+    parser.add_argument('--obstacle-width', type=int, default=20)
+    parser.add_argument('--obstacle-height', type=int, default=15)
+    parser.add_argument('--num-obstacles', type=int, default=20)
+    parser.add_argument('--map-seed', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=0, help='seed used to sample the start and goal positions')
+    parser.add_argument('--queries', type=int, default=100, help='number of problems solved by each algorithm')
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument('--open-lists', nargs='+', default=['heap'], choices=list(OPEN_LISTS),
+                        help='open lists compared (the radix heap is skipped for greedy and bidirectional search)')
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--output', default='benchmark.json', help='report file (.json or .csv)')
+    args = parser.parse_args()
+
+    cost_map = create_cost_map(args.width, args.height, args.obstacle_width, args.obstacle_height,
+                               args.num_obstacles, args.map_seed)
+    # Compiling the graph and the components before starting the workers, so they inherit them instead of
+    # building their own
+    cost_map.get_graph()
+    cost_map.get_components()
+    problems = create_problems(cost_map, args.queries, args.seed)
+    queries = [(number, algorithm, open_list, start_position, goal_position)
+               for number, (start_position, goal_position) in enumerate(problems)
+               for algorithm in args.algorithms for open_list in args.open_lists
+               if not (open_list == 'radix' and (algorithm == 'greedy' or algorithm.startswith('bidirectional')))]
+
+    tic = time.perf_counter()
+    if args.processes > 1:
+        with multiprocessing.Pool(args.processes, initializer=initialize_worker, initargs=(cost_map,)) as pool:
+            results = pool.map(run_query, queries, chunksize=max(1, len(queries) // (4 * args.processes)))
+    else:
+        initialize_worker(cost_map)
+        results = [run_query(query) for query in queries]
+    toc = time.perf_counter()
+
+    summary = summarize(results)
+    write_report(args.output, vars(args), summary, results)
+    for name in summary:
+        print(r'{0}: compute time: mean: {1}, std: {2}, expansions: mean: {3}'.format(
+            name, summary[name]['time_mean'], summary[name]['time_std'], summary[name]['expansions_mean']))
+    print(r'{0} queries in {1} s'.format(len(queries), toc - tic))
+
+
+if __name__ == '__main__':
+    main()
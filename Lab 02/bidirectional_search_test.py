@@ -0,0 +1,32 @@
+import math
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+
+NUM_MAPS = 3
+NUM_PROBLEMS = 10  # problems of each map
+ALGORITHMS = ['bidirectional_dijkstra', 'bidirectional_a_star']
+OPEN_LISTS = ['heap', 'indexed']
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+
+num_plans = 0
+for seed in range(NUM_MAPS):
+    cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+    path_planner = PathPlanner(cost_map)
+    for start_position, goal_position in create_problems(cost_map, NUM_PROBLEMS, seed):
+        expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+        for algorithm in ALGORITHMS:
+            for open_list in OPEN_LISTS:
+                path, cost = getattr(path_planner, algorithm)(start_position, goal_position, open_list)
+                assert math.isclose(cost, expected_cost, rel_tol=COST_TOLERANCE), (algorithm, open_list,
+                                                                                  start_position, goal_position,
+                                                                                  cost, expected_cost)
+                if path:
+                    assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+                    # The halves of the two searches must be joined by a step between neighbor cells
+                    assert all([max(abs(path[k][0] - path[k + 1][0]), abs(path[k][1] - path[k + 1][1])) == 1
+                                for k in range(len(path) - 1)]), (algorithm, path)
+                    path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)])
+                    assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (algorithm, path_cost, cost)
+                num_plans += 1
+print(r'The bidirectional searches match Dijkstra in {0} plans'.format(num_plans))
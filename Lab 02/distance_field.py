@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from path_planner import PathPlanner
+from math import inf, sqrt
+import numpy as np
+
+
+class DistanceFieldCache(object):
+    """
+    Represents a cache of goal-rooted distance fields (the cost-to-go from every cell to a goal) of a cost map.
+    Once the distance field of a goal is known, a path to it is obtained by following the gradient of the field.
+    """
+    def __init__(self, cost_map, max_size=8, solver='dijkstra'):
+        """
+        Creates a distance field cache for a given cost map.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        :param max_size: maximum number of distance fields kept in the cache (least recently used are discarded).
+        :type max_size: int.
+        :param solver: how the distance fields are computed: 'dijkstra' or 'wavefront' (WavefrontSolver).
+        :type solver: str.
+        """
+        self.cost_map = cost_map
+        self.max_size = max_size
+        if solver == 'dijkstra':
+            self.path_planner = PathPlanner(cost_map)
+        elif solver == 'wavefront':
+            self.path_planner = WavefrontSolver(cost_map)
+        else:
+            raise ValueError('Unknown distance field solver: %s' % solver)
+        # Maps (goal, map version) to the distance field of the goal, ordered from least to most recently used
+        self.fields = OrderedDict()
+
+    def get_distance_field(self, goal_position):
+        """
+        Obtains the distance field of a goal, computing it only if it is not in the cache.
+
+        :param goal_position: goal position as a tuple (x, y).
+        :type goal_position: tuple.
+        :return: the cost-to-go from every cell to the goal (inf for cells which can not reach it).
+        :rtype: numpy array of shape (height, width).
+        """
+        key = (tuple(goal_position), self.cost_map.version)
+        if key in self.fields:
+            self.fields.move_to_end(key)
+            return self.fields[key]
+        # Fields computed for other versions of the map are outdated and must be discarded
+        for cached_key in list(self.fields):
+            if cached_key[1] != self.cost_map.version:
+                del self.fields[cached_key]
+        field = self.path_planner.compute_distance_field(goal_position)
+        self.fields[key] = field
+        if len(self.fields) > self.max_size:
+            self.fields.popitem(last=False)
+        return field
+
+    def plan(self, start_position, goal_position):
+        """
+        Plans a path by following the gradient of the distance field of the goal.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        field = self.get_distance_field(goal_position)
+        cost = field[start_position[0], start_position[1]]
+        if cost == inf:
+            return [], inf
+        graph = self.cost_map.get_graph()
+        distances = field.ravel()
+        width = self.cost_map.width
+        current = start_position[0] * width + start_position[1]
+        goal = goal_position[0] * width + goal_position[1]
+        path = [tuple(start_position)]
+        while current != goal:
+            # The next cell in an optimal path is the successor which minimizes the edge cost plus its cost-to-go
+            successors, costs = graph.get_successors(current)
+            current = int(successors[np.argmin(costs + distances[successors])])
+            path.append(divmod(current, width))
+        return path, float(cost)
+
+
+class WavefrontSolver(object):
+    """
+    Represents a solver of distance fields which relaxes whole rows and columns of the map with NumPy instead of
+    expanding one cell at a time. Each round sweeps the map downwards, upwards, to the right and to the left,
+    relaxing every cell from the previous row (or column) through the three edges which point in the direction of
+    the sweep. A path is propagated in a single round unless it turns back, so only a few rounds are needed until
+    the distances stop changing, which makes them the fixed point of the Bellman equations, i.e. the Dijkstra costs.
+    """
+    def __init__(self, cost_map):
+        """
+        Creates a wavefront solver for a given cost map.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        """
+        self.cost_map = cost_map
+        self.version = None
+        self.sweeps = None
+
+    def get_sweeps(self):
+        """
+        Obtains the views used by each sweep, which are only rebuilt when the map changes. Every sweep is seen as
+        a downward sweep of a flipped or transposed view of the map, so the same code relaxes all of them.
+
+        :return: for each sweep, how the view is obtained from the map and the edge costs of the view, where
+            costs[dj][i, j] is the cost of the edge from (i - 1, j - dj) to (i, j) (inf if there is none).
+        :rtype: list of tuples.
+        """
+        if self.sweeps is None or self.version != self.cost_map.version:
+            grid = self.cost_map.grid
+            height, width = grid.shape
+            free = grid >= 0.0
+            # entering[(di, dj)][i, j] is the cost of the edge from (i - di, j - dj) to (i, j)
+            entering = {}
+            for di in range(-1, 2):
+                for dj in range(-1, 2):
+                    if di == 0 and dj == 0:
+                        continue
+                    costs = np.full((height, width), inf)
+                    target = (slice(max(0, di), height + min(0, di)), slice(max(0, dj), width + min(0, dj)))
+                    source = (slice(max(0, -di), height + min(0, -di)), slice(max(0, -dj), width + min(0, -dj)))
+                    factor = sqrt(2) if di != 0 and dj != 0 else 1.0
+                    costs[target] = factor * (grid[source] + grid[target]) / 2.0
+                    # Edges only enter free cells
+                    costs[~free] = inf
+                    entering[(di, dj)] = costs
+
+            # Each sweep is (if the view is transposed, if it is flipped, edge costs of the view)
+            self.sweeps = []
+            for transpose, reverse, direction in [(False, False, (1, 0)), (False, True, (-1, 0)),
+                                                  (True, False, (0, 1)), (True, True, (0, -1))]:
+                costs = {}
+                for k in range(-1, 2):
+                    # The third edge of the sweep is the straight one plus a diagonal step k
+                    di, dj = direction
+                    view = entering[(di, k) if di != 0 else (k, dj)]
+                    view = view.T if transpose else view
+                    costs[k] = np.ascontiguousarray(view[::-1] if reverse else view)
+                self.sweeps.append((transpose, reverse, costs))
+            self.version = self.cost_map.version
+        return self.sweeps
+
+    def compute_distance_field(self, position):
+        """
+        Computes the cost of the optimal path between a position and every cell of the map.
+
+        :param position: position where the distance field is rooted as a tuple (x, y).
+        :type position: tuple.
+        :return: the cost of every cell (inf for cells which can not be reached).
+        :rtype: numpy array of shape (height, width).
+        """
+        return self.compute_distance_fields([position])[0]
+
+    def compute_distance_fields(self, positions):
+        """
+        Computes the distance fields of many positions at once, relaxing the same row of all of them with each NumPy
+        operation, so the overhead of the operations is shared by the fields.
+
+        :param positions: positions where the distance fields are rooted as tuples (x, y).
+        :type positions: list of tuples.
+        :return: the cost of every cell of each field (inf for cells which can not be reached).
+        :rtype: numpy array of shape (len(positions), height, width).
+        """
+        sweeps = self.get_sweeps()
+        distances = np.full((len(positions), self.cost_map.height, self.cost_map.width), inf)
+        for k, position in enumerate(positions):
+            distances[k, position[0], position[1]] = 0.0
+        # Fields which changed in the last round, and so are not known to be converged yet
+        active = np.arange(len(positions))
+        while active.size > 0:
+            fields = distances[active]
+            previous = fields.copy()
+            for transpose in (False, True):
+                # The sweeps along the rows relax a transposed copy, so they also read contiguous memory
+                view = np.ascontiguousarray(fields.transpose(0, 2, 1)) if transpose else fields
+                for sweep_transpose, reverse, costs in sweeps:
+                    if sweep_transpose != transpose:
+                        continue
+                    lines = view[:, ::-1] if reverse else view
+                    for i in range(1, lines.shape[1]):
+                        last = lines[:, i - 1]
+                        row = lines[:, i]
+                        np.minimum(row, last + costs[0][i], out=row)
+                        np.minimum(row[:, 1:], last[:, :-1] + costs[1][i, 1:], out=row[:, 1:])
+                        np.minimum(row[:, :-1], last[:, 1:] + costs[-1][i, :-1], out=row[:, :-1])
+                if transpose:
+                    fields = np.ascontiguousarray(view.transpose(0, 2, 1))
+            distances[active] = fields
+            active = active[np.any(fields != previous, axis=(1, 2))]
+        return distances
@@ -0,0 +1,42 @@
+import math
+import numpy as np
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+from distance_field import DistanceFieldCache, WavefrontSolver
+
+NUM_MAPS = 3
+NUM_ROUNDS = 2  # the map gets new obstacles after each round, so the solver must rebuild its sweeps
+NUM_PROBLEMS = 5  # problems of each round, whose goals are the roots of the fields
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+
+num_fields = 0
+for seed in range(NUM_MAPS):
+    cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+    path_planner = PathPlanner(cost_map)
+    solver = WavefrontSolver(cost_map)
+    cache = DistanceFieldCache(cost_map, solver='wavefront')
+    for round_number in range(NUM_ROUNDS):
+        problems = create_problems(cost_map, NUM_PROBLEMS, seed + 10 * round_number)
+        goal_positions = [goal_position for start_position, goal_position in problems]
+        # The fields computed together are the same as the ones computed one by one
+        fields = solver.compute_distance_fields(goal_positions)
+        for (start_position, goal_position), field in zip(problems, fields):
+            expected_field = path_planner.compute_distance_field(goal_position)
+            assert np.array_equal(np.isinf(field), np.isinf(expected_field)), goal_position
+            assert np.allclose(field[field < math.inf], expected_field[expected_field < math.inf],
+                               rtol=COST_TOLERANCE), goal_position
+            assert np.array_equal(solver.compute_distance_field(goal_position), field), goal_position
+            # Following the field of the goal gives an optimal path
+            expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+            path, cost = cache.plan(start_position, goal_position)
+            assert math.isclose(cost, expected_cost, rel_tol=COST_TOLERANCE), (start_position, goal_position, cost,
+                                                                              expected_cost)
+            if path:
+                assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+                path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)])
+                assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (path_cost, cost)
+            num_fields += 1
+        for obstacle in range(5):
+            cost_map.add_random_obstacle(20, 15)
+print(r'The wavefront distance fields match Dijkstra in {0} fields'.format(num_fields))
@@ -1,7 +1,11 @@
 import numpy as np
 import random
+from collections import deque
 from math import inf, sqrt
 
+# Maximum number of edits remembered by a cost map
+MAX_EDITS = 1024
+
 
 class CostMap(object):
     """
@@ -19,6 +23,16 @@ class CostMap(object):
         self.width = width
         self.height = height
         self.grid = np.ones((height, width))
+        # One bit per cell, set if the cell is occupied, where each row starts at a new 64-bit word. The map is
+        # surrounded by a border of occupied cells, so cell (i, j) is bit j + 1 of row i + 1
+        self.occupancy = np.zeros((height + 2, (width + 2 + 63) // 64), dtype=np.uint64)
+        self.update_occupancy(0, height)
+        # The version is incremented whenever the map changes, so derived data can be cached per version
+        self.version = 0
+        self.graph = None
+        self.components = None
+        # Recent edits as (version, (top, left, bottom, right)), so derived data may be updated only where the map changed
+        self.edits = deque(maxlen=MAX_EDITS)
 
     def get_cell_cost(self, i, j):
         """
@@ -61,6 +75,50 @@ class CostMap(object):
         """
         return self.grid[i][j] < 0.0
 
+    def update_occupancy(self, top, bottom):
+        """
+        Updates the occupancy bitmap of some rows from the cost grid.
+
+        :param top: first row updated.
+        :type top: int.
+        :param bottom: row after the last one updated.
+        :type bottom: int.
+        """
+        words = self.occupancy.shape[1]
+        occupied = np.ones((bottom - top, words * 64), dtype=bool)
+        occupied[:, 1:self.width + 1] = self.grid[top:bottom] < 0.0
+        self.occupancy[top + 1:bottom + 1] = np.packbits(occupied, axis=1, bitorder='little').view('<u8')
+        # The border rows are always occupied
+        self.occupancy[0] = ~np.uint64(0)
+        self.occupancy[-1] = ~np.uint64(0)
+
+    def get_neighbor_mask(self, i, j):
+        """
+        Obtains which 8-connected neighbors of a cell are free, reading three bits of each of the rows around it.
+
+        :param i: the row of the cell.
+        :type i: int.
+        :param j: the column of the cell.
+        :type j: int.
+        :return: a mask whose bit k is set if the neighbor in the direction CostMapGraph.DIRECTIONS[k] is free.
+        :rtype: int.
+        """
+        read = self.occupancy.item
+        # Columns j - 1 to j + 1 are bits j to j + 2 of the padded rows i to i + 2
+        word = j >> 6
+        shift = j & 63
+        if shift <= 61:
+            top = read(i, word) >> shift & 7
+            middle = read(i + 1, word) >> shift & 7
+            bottom = read(i + 2, word) >> shift & 7
+        else:
+            # The three bits are split between two words
+            top = (read(i, word) >> shift | read(i, word + 1) << (64 - shift)) & 7
+            middle = (read(i + 1, word) >> shift | read(i + 1, word + 1) << (64 - shift)) & 7
+            bottom = (read(i + 2, word) >> shift | read(i + 2, word + 1) << (64 - shift)) & 7
+        occupied = top | (middle & 1) << 3 | (middle >> 2) << 4 | bottom << 5
+        return ~occupied & 0xFF
+
     def is_index_valid(self, i, j):
         """
         Check if a (i,j) position is valid (is within the map boundaries).
@@ -74,6 +132,66 @@ class CostMap(object):
         """
         return 0 <= i < self.height and 0 <= j < self.width
 
+    def get_edits_since(self, version):
+        """
+        Obtains the regions of the map which were edited after a given version.
+
+        :param version: version of the map.
+        :type version: int.
+        :return: the edited regions as (top, left, bottom, right), or None if the edits are no longer remembered.
+        :rtype: list of tuples.
+        """
+        if version == self.version:
+            return []
+        if not self.edits or self.edits[0][0] > version + 1:
+            return None
+        return [rectangle for edit_version, rectangle in self.edits if edit_version > version]
+
+    def get_graph(self):
+        """
+        Obtains the compiled graph of this cost map, which is only rebuilt when the map changes.
+
+        :return: the compiled graph of the current version of the map.
+        :rtype: CostMapGraph.
+        """
+        if self.graph is None or self.graph.version != self.version:
+            self.graph = CostMapGraph(self)
+        return self.graph
+
+    def get_components(self):
+        """
+        Obtains the connected components of the free cells of this cost map, which are only updated when the map
+        changes.
+
+        :return: the connected components of the current version of the map.
+        :rtype: ConnectedComponents.
+        """
+        if self.components is None:
+            self.components = ConnectedComponents(self)
+        elif self.components.version != self.version:
+            self.components.update(self)
+        return self.components
+
+    def is_reachable(self, start, goal):
+        """
+        Checks in O(1) if a path may exist between two cells.
+
+        :param start: the cell where the path starts.
+        :type start: tuple.
+        :param goal: the cell where the path ends.
+        :type goal: tuple.
+        :return: False if no path between the cells exists, True otherwise.
+        :rtype: bool.
+        """
+        labels = self.get_components().labels
+        goal_label = labels[goal[0], goal[1]]
+        if goal_label < 0:
+            # No edge enters an occupied cell
+            return False
+        start_label = labels[start[0], start[1]]
+        # Edges leave occupied cells, so a search started inside an obstacle may still find a path
+        return start_label < 0 or start_label == goal_label
+
     def add_random_obstacle(self, width, height):
         """
         Adds a random obstacle to the map.
@@ -96,6 +214,45 @@ class CostMap(object):
         self.add_rectangle((rectangle[0] - 1, rectangle[1] - 1, rectangle[2] + 2, rectangle[3] + 2), 2.0)
         self.add_rectangle(rectangle, -1.0)
 
+    def add_obstacles(self, rectangles):
+        """
+        Adds many obstacles at once. The result is the same as calling add_obstacle() for each rectangle:
+        halos never overwrite occupied cells.
+
+        :param rectangles: rectangles defined as (x, y, width, height), where (x, y) is the top left corner.
+        :type rectangles: numpy array of shape (number of obstacles, 4).
+        """
+        rectangles = np.asarray(rectangles, dtype=np.int64).reshape(-1, 4)
+        halos = rectangles + np.array([-1, -1, 2, 2])
+        free = self.grid >= 0.0
+        self.grid[self.get_coverage(halos) & free] = 2.0
+        self.grid[self.get_coverage(rectangles)] = -1.0
+        self.update_occupancy(0, self.height)
+        self.record_edits(halos)
+
+    def get_coverage(self, rectangles):
+        """
+        Computes which cells are covered by at least one of many rectangles, using a 2D difference array
+        so the cost does not depend on the size of the rectangles.
+
+        :param rectangles: rectangles defined as (x, y, width, height), where (x, y) is the top left corner.
+        :type rectangles: numpy array of shape (number of rectangles, 4).
+        :return: True for each covered cell.
+        :rtype: numpy array of bool with shape (height, width).
+        """
+        left = np.clip(rectangles[:, 0], 0, self.width)
+        right = np.clip(rectangles[:, 0] + rectangles[:, 2], 0, self.width)
+        top = np.clip(rectangles[:, 1], 0, self.height)
+        bottom = np.clip(rectangles[:, 1] + rectangles[:, 3], 0, self.height)
+        valid = (left < right) & (top < bottom)
+        left, right, top, bottom = left[valid], right[valid], top[valid], bottom[valid]
+        difference = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+        np.add.at(difference, (top, left), 1)
+        np.add.at(difference, (top, right), -1)
+        np.add.at(difference, (bottom, left), -1)
+        np.add.at(difference, (bottom, right), 1)
+        return np.cumsum(np.cumsum(difference, axis=0), axis=1)[:self.height, :self.width] > 0
+
     def add_rectangle(self, rectangle, value):
         """
         Changes the values of a rectangular region to a given value.
@@ -103,14 +260,42 @@ class CostMap(object):
         :param rectangle: rectangular region defined as (x, y, width, height), where (x, y) is the top left corner.
         :param value: the value used in the rectangular region.
         """
-        left = rectangle[0]
-        right = rectangle[0] + rectangle[2]
-        top = rectangle[1]
-        bottom = rectangle[1] + rectangle[3]
-        for j in range(left, right):
-            for i in range(top, bottom):
-                if self.is_index_valid(i, j) and not self.is_occupied(i, j):
-                    self.grid[i, j] = value
+        top, left, bottom, right = self.clip_rectangle(rectangle)
+        region = self.grid[top:bottom, left:right]
+        region[region >= 0.0] = value
+        if value < 0.0:
+            self.update_occupancy(top, bottom)
+        self.record_edits([rectangle])
+
+    def clip_rectangle(self, rectangle):
+        """
+        Clips a rectangle to the map boundaries.
+
+        :param rectangle: a rectangle defined as (x, y, width, height), where (x, y) is the top left corner.
+        :type rectangle: 4-dimensional tuple.
+        :return: the clipped region as (top, left, bottom, right), where bottom and right are exclusive.
+        :rtype: 4-dimensional tuple of int.
+        """
+        top = min(max(int(rectangle[1]), 0), self.height)
+        left = min(max(int(rectangle[0]), 0), self.width)
+        bottom = min(max(int(rectangle[1] + rectangle[3]), top), self.height)
+        right = min(max(int(rectangle[0] + rectangle[2]), left), self.width)
+        return top, left, bottom, right
+
+    def record_edits(self, rectangles):
+        """
+        Starts a new version of the map after some rectangles were edited.
+
+        :param rectangles: the edited rectangles defined as (x, y, width, height).
+        :type rectangles: list of 4-dimensional tuples.
+        """
+        self.version += 1
+        if len(rectangles) > MAX_EDITS:
+            # The edits of this version would not fit, so every edit is forgotten
+            self.edits.clear()
+            return
+        for rectangle in rectangles:
+            self.edits.append((self.version, self.clip_rectangle(rectangle)))
 
     def create_random_map(self, obstacle_width, obstacle_height, num_obstacles):
         """
@@ -123,14 +308,228 @@ class CostMap(object):
         :param num_obstacles: number of obstacles.
         :type num_obstacles: int.
         """
+        # The positions are sampled exactly as in add_random_obstacle(), so a given seed still produces the same map
+        rectangles = []
         for i in range(num_obstacles):
-            self.add_random_obstacle(obstacle_width, obstacle_height)
+            top_left = (random.randint(0, self.width - 1), random.randint(0, self.height - 1))
+            rectangles.append((top_left[0], top_left[1], obstacle_width, obstacle_height))
+        self.add_obstacles(rectangles)
+
+
+class CostMapGraph(object):
+    """
+    Represents a compiled view of a cost map as a graph in compressed sparse row (CSR) format.
+    The successors of the cell with flat index i * width + j are neighbors[offsets[index]:offsets[index + 1]]
+    and the costs of the corresponding edges are stored in the same positions of costs.
+    """
+    # 8-connected neighborhood, in the same order used by NodeGrid.get_successors()
+    DIRECTIONS = [(di, dj) for di in range(-1, 2) for dj in range(-1, 2) if di != 0 or dj != 0]
+
+    def __init__(self, cost_map):
+        """
+        Compiles the graph of a cost map.
+
+        :param cost_map: cost map to be compiled.
+        :type cost_map: CostMap.
+        """
+        self.width = cost_map.width
+        self.height = cost_map.height
+        self.version = cost_map.version
+        height, width = self.height, self.width
+        grid = cost_map.grid
+        free = grid >= 0.0
+        rows, cols = np.indices((height, width))
+        neighbors = np.empty((height, width, len(self.DIRECTIONS)), dtype=np.int32)
+        costs = np.empty((height, width, len(self.DIRECTIONS)))
+        valid = np.zeros((height, width, len(self.DIRECTIONS)), dtype=bool)
+        # A cell is uniform if all its free neighbors have the same cost as itself
+        uniform = free.copy()
+        for k, (di, dj) in enumerate(self.DIRECTIONS):
+            # Region of the source cells whose neighbor in direction (di, dj) is inside the map
+            source = (slice(max(0, -di), height - max(0, di)), slice(max(0, -dj), width - max(0, dj)))
+            target = (slice(max(0, di), height - max(0, -di)), slice(max(0, dj), width - max(0, -dj)))
+            factor = sqrt(2) if di != 0 and dj != 0 else 1.0
+            valid[source + (k,)] = free[target]
+            neighbors[source + (k,)] = (rows[target] * width + cols[target])
+            costs[source + (k,)] = factor * (grid[source] + grid[target]) / 2.0
+            uniform[source] &= ~free[target] | (grid[target] == grid[source])
+        self.uniform = uniform
+        # Free cells surrounded by a border of occupied cells, so they may be queried without bounds checks
+        self.free = np.pad(free, 1, constant_values=False)
+        # Only computed when a planner needs them
+        self.jump_distances = None
+        valid = valid.reshape(height * width, -1)
+        self.offsets = np.zeros(height * width + 1, dtype=np.int64)
+        np.cumsum(np.count_nonzero(valid, axis=1), out=self.offsets[1:])
+        self.neighbors = neighbors.reshape(height * width, -1)[valid]
+        self.costs = costs.reshape(height * width, -1)[valid]
+
+    def get_successors(self, index):
+        """
+        Obtains the 8-connected successors of a cell and the costs of the edges to them.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: flat indices of the successors and costs of the edges.
+        :rtype: tuple of numpy arrays.
+        """
+        begin = self.offsets[index]
+        end = self.offsets[index + 1]
+        return self.neighbors[begin:end], self.costs[begin:end]
+
+    def get_successor_lists(self, index):
+        """
+        Obtains the 8-connected successors of a cell and the costs of the edges to them as lists, which are faster
+        to iterate in Python than numpy arrays.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: flat indices of the successors and costs of the edges.
+        :rtype: tuple of lists.
+        """
+        begin = self.offsets[index]
+        end = self.offsets[index + 1]
+        return self.neighbors[begin:end].tolist(), self.costs[begin:end].tolist()
+
+    def get_jump_distances(self):
+        """
+        Obtains, for each straight direction and each cell, the number of steps until a straight jump of
+        Jump Point Search must stop: at an occupied cell, at a cell which is not uniform or at a cell
+        with a forced neighbor.
+
+        :return: a dictionary mapping each straight direction (di, dj) to the steps of every cell.
+        :rtype: dict of numpy arrays.
+        """
+        if self.jump_distances is None:
+            height, width = self.height, self.width
+
+            def free(di, dj):
+                # free(di, dj)[i, j] tells if the cell (i + di, j + dj) is free
+                return self.free[1 + di:1 + di + height, 1 + dj:1 + dj + width]
+
+            self.jump_distances = {}
+            for di, dj in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                if di == 0:
+                    forced = (~free(1, 0) & free(1, dj)) | (~free(-1, 0) & free(-1, dj))
+                else:
+                    forced = (~free(0, 1) & free(di, 1)) | (~free(0, -1) & free(di, -1))
+                stop = ~self.uniform | forced
+                # Computing the distances as if moving to the right, flipping and transposing as needed
+                if di != 0:
+                    stop = stop.T
+                if di + dj < 0:
+                    stop = stop[:, ::-1]
+                columns = np.arange(stop.shape[1])
+                first_stop = np.minimum.accumulate(np.where(stop, columns, stop.shape[1])[:, ::-1], axis=1)[:, ::-1]
+                next_stop = np.full(stop.shape, stop.shape[1])
+                next_stop[:, :-1] = first_stop[:, 1:]
+                steps = (next_stop - columns).astype(np.int32)
+                if di + dj < 0:
+                    steps = steps[:, ::-1]
+                if di != 0:
+                    steps = steps.T
+                self.jump_distances[(di, dj)] = np.ascontiguousarray(steps)
+        return self.jump_distances
+
+
+class ConnectedComponents(object):
+    """
+    Represents a labeling of the 8-connected components of the free cells of a cost map. Since obstacles are only
+    added, a component can only split, so an update only labels again the components which lost free cells.
+    """
+    # Half of the 8-connected neighborhood, so each pair of neighbors is only considered once
+    DIRECTIONS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+    def __init__(self, cost_map):
+        """
+        Labels the connected components of a cost map.
+
+        :param cost_map: cost map to be labeled.
+        :type cost_map: CostMap.
+        """
+        self.version = cost_map.version
+        self.free = cost_map.grid >= 0.0
+        # Label of the component of each cell (-1 for occupied cells)
+        self.labels = self.label(self.free)
+        self.num_labels = int(np.max(self.labels)) + 1
+
+    def update(self, cost_map):
+        """
+        Updates the labeling after the cost map changed.
+
+        :param cost_map: cost map which is labeled.
+        :type cost_map: CostMap.
+        """
+        free = cost_map.grid >= 0.0
+        edits = cost_map.get_edits_since(self.version)
+        if edits is None:
+            self.__init__(cost_map)
+            return
+        removed = np.zeros(free.shape, dtype=bool)
+        for top, left, bottom, right in edits:
+            removed[top:bottom, left:right] |= self.free[top:bottom, left:right] & ~free[top:bottom, left:right]
+        if np.any(removed):
+            affected = np.isin(self.labels, np.unique(self.labels[removed])) & free
+            labels = self.label(affected)
+            self.labels[~free] = -1
+            self.labels[affected] = labels[affected] + self.num_labels
+            self.num_labels += int(np.max(labels)) + 1
+        self.free = free
+        self.version = cost_map.version
+
+    @staticmethod
+    def label(mask):
+        """
+        Labels the 8-connected components of a mask by hooking the roots of neighboring cells to the smallest
+        one and compressing the trees, until no pair of neighbors has different roots.
+
+        :param mask: True for the cells which are labeled.
+        :type mask: numpy array of bool with shape (height, width).
+        :return: the label of each cell, numbered from 0, or -1 for the cells outside the mask.
+        :rtype: numpy array of int with shape (height, width).
+        """
+        height, width = mask.shape
+        indices = np.arange(height * width).reshape(height, width)
+        first = []
+        second = []
+        for di, dj in ConnectedComponents.DIRECTIONS:
+            source = (slice(0, height - di), slice(max(0, -dj), width - max(0, dj)))
+            target = (slice(di, height), slice(max(0, dj), width - max(0, -dj)))
+            both = mask[source] & mask[target]
+            first.append(indices[source][both])
+            second.append(indices[target][both])
+        first = np.concatenate(first)
+        second = np.concatenate(second)
+        roots = np.arange(height * width)
+        while True:
+            first_roots = roots[first]
+            second_roots = roots[second]
+            different = first_roots != second_roots
+            if not np.any(different):
+                break
+            first_roots = first_roots[different]
+            second_roots = second_roots[different]
+            np.minimum.at(roots, np.maximum(first_roots, second_roots), np.minimum(first_roots, second_roots))
+            # Pointer jumping until every cell points to its root
+            while True:
+                next_roots = roots[roots]
+                if np.array_equal(next_roots, roots):
+                    break
+                roots = next_roots
+        labels = np.full(height * width, -1, dtype=np.int32)
+        cells = mask.ravel()
+        labels[cells] = np.unique(roots[cells], return_inverse=True)[1]
+        return labels.reshape(height, width)
 
 
 class NodeGrid(object):
     """
     Represents a grid of graph nodes used by the planning algorithms.
     """
+    # Directions of the free neighbors given by each neighbor mask of CostMap.get_neighbor_mask()
+    MASK_DIRECTIONS = [[direction for k, direction in enumerate(CostMapGraph.DIRECTIONS) if mask >> k & 1]
+                       for mask in range(256)]
+
     def __init__(self, cost_map):
         """
         Creates a grid of graph nodes.
@@ -178,13 +577,185 @@ class NodeGrid(object):
         :return: list of the 8-connected successors.
         :rtype: list of Node.
         """
-        successors = []
-        for di in range(-1, 2):
-            for dj in range(-1, 2):
-                if di != 0 or dj != 0:
-                    if self.cost_map.is_index_valid(i + di, j + dj) and not self.cost_map.is_occupied(i + di, j + dj):
-                        successors.append((i + di, j + dj))
-        return successors
+        return [(i + di, j + dj) for di, dj in self.MASK_DIRECTIONS[self.cost_map.get_neighbor_mask(i, j)]]
+
+
+class SearchState(object):
+    """
+    Represents the search state used by the planning algorithms as flat arrays indexed by i * width + j.
+    An entry is only valid if its stamp matches the current generation, so the state is reset in O(1)
+    by simply starting a new generation.
+    """
+    def __init__(self, cost_map):
+        """
+        Creates the search state for a given cost map.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        """
+        self.cost_map = cost_map
+        self.width = cost_map.width
+        self.height = cost_map.height
+        size = self.width * self.height
+        self.g = np.full(size, inf)
+        self.f = np.full(size, inf)
+        self.parent = np.full(size, -1, dtype=np.int32)
+        # Generation in which g, f and parent were last written and in which the cell was closed
+        self.stamp = np.zeros(size, dtype=np.uint32)
+        self.closed = np.zeros(size, dtype=np.uint32)
+        self.generation = 0
+
+    def reset(self):
+        """
+        Resets the search state to prepare it for a new path planning.
+        """
+        self.generation += 1
+        if self.generation > np.iinfo(np.uint32).max:
+            # The stamps would wrap around, so we pay for a full reset once every 2^32 searches
+            self.stamp.fill(0)
+            self.closed.fill(0)
+            self.generation = 1
+
+    def get_index(self, i, j):
+        """
+        Obtains the flat index of the cell at row i and column j.
+
+        :param i: row of the cell.
+        :type i: int.
+        :param j: column of the cell.
+        :type j: int.
+        :return: flat index of the cell.
+        :rtype: int.
+        """
+        return i * self.width + j
+
+    def get_position(self, index):
+        """
+        Obtains the position of the cell with a given flat index.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: (i, j) where i is the row and j is the column of the cell.
+        :rtype: 2-dimensional tuple of int.
+        """
+        return divmod(int(index), self.width)
+
+    def get_g(self, index):
+        """
+        Obtains the cost-to-come of a cell in the current search.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: cost-to-come of the cell (inf if the cell was not reached).
+        :rtype: float.
+        """
+        return float(self.g[index]) if self.stamp[index] == self.generation else inf
+
+    def is_closed(self, index):
+        """
+        Checks if a cell was closed in the current search.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: True if the cell is closed, False otherwise.
+        :rtype: bool.
+        """
+        return self.closed[index] == self.generation
+
+    def get_distances(self):
+        """
+        Obtains the cost-to-come of every cell in the current search.
+
+        :return: cost-to-come of every cell (inf for cells which were not reached).
+        :rtype: numpy array.
+        """
+        return np.where(self.stamp == self.generation, self.g, inf)
+
+    def count_closed(self):
+        """
+        Counts the cells closed in the current search.
+
+        :return: number of closed cells.
+        :rtype: int.
+        """
+        return int(np.count_nonzero(self.closed == self.generation))
+
+    def construct_path(self, goal_index):
+        """
+        Extracts the path after a planning was executed.
+
+        :param goal_index: flat index of the cell where the goal was found.
+        :type goal_index: int.
+        :return: the path as a sequence of (x, y) positions: [(x1,y1),(x2,y2),(x3,y3),...,(xn,yn)].
+        :rtype: list of tuples.
+        """
+        reversed_path = []
+        index = goal_index
+        while index >= 0:
+            reversed_path.append(self.get_position(index))
+            index = int(self.parent[index])
+        return reversed_path[::-1]
+
+
+class DefaultArray(dict):
+    """
+    Represents a sparse array as a dictionary, where the entries which were never written have a default value.
+    """
+    def __init__(self, default):
+        """
+        Creates an empty sparse array.
+
+        :param default: value of the entries which were never written.
+        :type default: float or int.
+        """
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, index):
+        return self.default
+
+
+class SparseSearchState(SearchState):
+    """
+    Represents a search state which only stores the cells touched by the search, so its memory does not depend on
+    the size of the map. It has the same interface as SearchState, so the planners use it in the same way.
+    """
+    def __init__(self, cost_map):
+        """
+        Creates the search state for a given cost map.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap or TiledCostMap.
+        """
+        self.cost_map = cost_map
+        self.width = cost_map.width
+        self.height = cost_map.height
+        self.g = DefaultArray(inf)
+        self.f = DefaultArray(inf)
+        self.parent = DefaultArray(-1)
+        self.stamp = DefaultArray(0)
+        self.closed = DefaultArray(0)
+        # The arrays are emptied by reset(), so every search uses the same generation
+        self.generation = 1
+
+    def reset(self):
+        """
+        Resets the search state to prepare it for a new path planning.
+        """
+        for array in [self.g, self.f, self.parent, self.stamp, self.closed]:
+            array.clear()
+
+    def get_distances(self):
+        raise ValueError('A sparse search state does not store the distances of every cell')
+
+    def count_closed(self):
+        """
+        Counts the cells closed in the current search.
+
+        :return: number of closed cells.
+        :rtype: int.
+        """
+        return len(self.closed)
 
 
 class Node(object):
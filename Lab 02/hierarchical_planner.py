@@ -0,0 +1,406 @@
+from math import inf, sqrt
+import heapq
+
+# Entrances at least this long get a transition at each end instead of a single one at the middle
+LONG_ENTRANCE = 6
+
+
+class HierarchicalPlanner(object):
+    """
+    Represents a hierarchical path planner (HPA*), which splits the cost map into square clusters, searches an
+    abstract graph whose nodes are the entrances between clusters and then refines the path only inside the
+    clusters it crosses. Cluster data is computed lazily and rebuilt only for the clusters touched by map edits.
+    The paths are near-optimal, since they are forced to cross clusters through the entrance nodes.
+    """
+    def __init__(self, cost_map, cluster_size=20):
+        """
+        Creates a hierarchical path planner for a given cost map.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        :param cluster_size: width and height of each cluster, in cells.
+        :type cluster_size: int.
+        """
+        self.cost_map = cost_map
+        self.cluster_size = cluster_size
+        self.num_cluster_rows = (cost_map.height + cluster_size - 1) // cluster_size
+        self.num_cluster_cols = (cost_map.width + cluster_size - 1) // cluster_size
+        self.version = cost_map.version
+        # Transitions between neighbor clusters as lists of (cell, cell, edge cost), indexed by the pair of clusters
+        self.borders = {}
+        # Searches from each node of a cluster restricted to the cluster, as (distances, parents) in local indices
+        self.cluster_searches = {}
+
+    def get_cluster(self, index):
+        """
+        Obtains the cluster which contains a cell.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: the cluster as (row, column).
+        :rtype: 2-dimensional tuple of int.
+        """
+        i, j = divmod(index, self.cost_map.width)
+        return i // self.cluster_size, j // self.cluster_size
+
+    def get_cluster_bounds(self, cluster):
+        """
+        Obtains the region of the map covered by a cluster.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :return: the region as (top, left, bottom, right), where bottom and right are exclusive.
+        :rtype: 4-dimensional tuple of int.
+        """
+        top = cluster[0] * self.cluster_size
+        left = cluster[1] * self.cluster_size
+        return top, left, min(top + self.cluster_size, self.cost_map.height), \
+            min(left + self.cluster_size, self.cost_map.width)
+
+    def get_neighbor_clusters(self, cluster):
+        """
+        Obtains the clusters around a cluster, including the diagonal ones.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :return: the neighbor clusters.
+        :rtype: list of 2-dimensional tuples of int.
+        """
+        neighbors = []
+        for di in range(-1, 2):
+            for dj in range(-1, 2):
+                if (di != 0 or dj != 0) and 0 <= cluster[0] + di < self.num_cluster_rows and \
+                        0 <= cluster[1] + dj < self.num_cluster_cols:
+                    neighbors.append((cluster[0] + di, cluster[1] + dj))
+        return neighbors
+
+    def synchronize(self):
+        """
+        Discards the cluster data made outdated by the edits of the cost map since the last synchronization.
+        """
+        if self.version == self.cost_map.version:
+            return
+        edits = self.cost_map.get_edits_since(self.version)
+        self.version = self.cost_map.version
+        if edits is None:
+            self.borders = {}
+            self.cluster_searches = {}
+            return
+        touched = set()
+        for top, left, bottom, right in edits:
+            if top >= bottom or left >= right:
+                continue
+            # A cell next to a cluster also changes the transitions in its border
+            for ci in range(max(top - 1, 0) // self.cluster_size, min(bottom, self.cost_map.height - 1) // self.cluster_size + 1):
+                for cj in range(max(left - 1, 0) // self.cluster_size, min(right, self.cost_map.width - 1) // self.cluster_size + 1):
+                    touched.add((ci, cj))
+        for key in list(self.borders):
+            if key[0] in touched or key[1] in touched:
+                del self.borders[key]
+        for cluster in touched:
+            self.cluster_searches.pop(cluster, None)
+            for neighbor in self.get_neighbor_clusters(cluster):
+                self.cluster_searches.pop(neighbor, None)
+
+    def get_border(self, cluster, neighbor):
+        """
+        Obtains the transitions between two neighbor clusters, computing them if needed.
+
+        :param cluster: the first cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :param neighbor: the second cluster as (row, column), which must come after the first one.
+        :type neighbor: 2-dimensional tuple of int.
+        :return: list of transitions as (cell in cluster, cell in neighbor, edge cost).
+        :rtype: list of tuples.
+        """
+        key = (cluster, neighbor)
+        if key not in self.borders:
+            self.borders[key] = self.compute_border(cluster, neighbor)
+        return self.borders[key]
+
+    def compute_border(self, cluster, neighbor):
+        """
+        Computes the transitions between two neighbor clusters. The border is split into entrances, which are
+        maximal segments of cells that may cross it, and each entrance gets one or two transitions.
+
+        :param cluster: the first cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :param neighbor: the second cluster as (row, column), which must come after the first one.
+        :type neighbor: 2-dimensional tuple of int.
+        :return: list of transitions as (cell in cluster, cell in neighbor, edge cost).
+        :rtype: list of tuples.
+        """
+        cost_map = self.cost_map
+        top, left, bottom, right = self.get_cluster_bounds(cluster)
+        di = neighbor[0] - cluster[0]
+        dj = neighbor[1] - cluster[1]
+        if di != 0 and dj != 0:
+            # Diagonal clusters may only be crossed between their corner cells
+            i = bottom - 1
+            j = right - 1 if dj > 0 else left
+            if not cost_map.is_occupied(i, j) and not cost_map.is_occupied(i + 1, j + dj):
+                return [(i * cost_map.width + j, (i + 1) * cost_map.width + j + dj,
+                         cost_map.get_edge_cost((i, j), (i + 1, j + dj)))]
+            return []
+        # Walking along the border, (i, j) is the cell of this cluster and (i + di, j + dj) the cell across the border
+        if dj != 0:
+            cells = [(i, right - 1) for i in range(top, bottom)]
+            along = (1, 0)
+        else:
+            cells = [(bottom - 1, j) for j in range(left, right)]
+            along = (0, 1)
+        crossings = []
+        for i, j in cells:
+            # The cell across the border which is reached with the cheapest move, if any
+            best = None
+            if not cost_map.is_occupied(i, j):
+                for k in (0, -1, 1):
+                    i_next, j_next = i + di + k * along[0], j + dj + k * along[1]
+                    inside_border = top <= i_next < bottom if dj != 0 else left <= j_next < right
+                    if inside_border and not cost_map.is_occupied(i_next, j_next):
+                        cost = cost_map.get_edge_cost((i, j), (i_next, j_next))
+                        if best is None or cost < best[1]:
+                            best = ((i_next, j_next), cost)
+            crossings.append(best)
+        transitions = []
+        begin = 0
+        while begin < len(cells):
+            if crossings[begin] is None:
+                begin += 1
+                continue
+            end = begin
+            while end + 1 < len(cells) and crossings[end + 1] is not None:
+                end += 1
+            if end - begin + 1 >= LONG_ENTRANCE:
+                chosen = [begin, end]
+            else:
+                chosen = [(begin + end) // 2]
+            for k in chosen:
+                (i, j), ((i_next, j_next), cost) = cells[k], crossings[k]
+                transitions.append((i * cost_map.width + j, i_next * cost_map.width + j_next, cost))
+            begin = end + 1
+        return transitions
+
+    def get_transitions(self, cluster):
+        """
+        Obtains the transitions leaving a cluster.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :return: list of transitions as (cell in cluster, cell in the other cluster, edge cost).
+        :rtype: list of tuples.
+        """
+        transitions = []
+        for neighbor in self.get_neighbor_clusters(cluster):
+            if neighbor > cluster:
+                transitions.extend(self.get_border(cluster, neighbor))
+            else:
+                transitions.extend((inside, outside, cost) for outside, inside, cost in self.get_border(neighbor, cluster))
+        return transitions
+
+    def search_cluster(self, cluster, source):
+        """
+        Runs the Dijkstra algorithm from a cell restricted to the cells of its cluster.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :param source: flat index of the cell where the search starts.
+        :type source: int.
+        :return: cost and parent of every cell of the cluster, indexed by local indices.
+        :rtype: tuple of lists.
+        """
+        return self.search_region(self.get_cluster_bounds(cluster), source)
+
+    def search_region(self, bounds, source):
+        """
+        Runs the Dijkstra algorithm from a cell restricted to a region of the map.
+
+        :param bounds: the region as (top, left, bottom, right), where bottom and right are exclusive.
+        :type bounds: 4-dimensional tuple of int.
+        :param source: flat index of the cell where the search starts.
+        :type source: int.
+        :return: cost and parent of every cell of the region, indexed by local indices.
+        :rtype: tuple of lists.
+        """
+        top, left, bottom, right = bounds
+        region = self.cost_map.grid[top:bottom, left:right].tolist()
+        height = bottom - top
+        width = right - left
+        source_i, source_j = divmod(source, self.cost_map.width)
+        start = (source_i - top) * width + source_j - left
+        distances = [inf] * (height * width)
+        parents = [-1] * (height * width)
+        closed = [False] * (height * width)
+        distances[start] = 0.0
+        pq = [(0.0, start)]
+        while pq:
+            distance, current = heapq.heappop(pq)
+            if closed[current]:
+                continue
+            closed[current] = True
+            i, j = divmod(current, width)
+            for di in range(-1, 2):
+                for dj in range(-1, 2):
+                    if (di != 0 or dj != 0) and 0 <= i + di < height and 0 <= j + dj < width and \
+                            region[i + di][j + dj] >= 0.0:
+                        factor = sqrt(2) if di != 0 and dj != 0 else 1.0
+                        successor = current + di * width + dj
+                        new_distance = distance + factor * (region[i][j] + region[i + di][j + dj]) / 2.0
+                        if new_distance < distances[successor]:
+                            distances[successor] = new_distance
+                            parents[successor] = current
+                            heapq.heappush(pq, (new_distance, successor))
+        return distances, parents
+
+    def get_cluster_searches(self, cluster):
+        """
+        Obtains the searches from each node of a cluster restricted to the cluster, computing them if needed.
+        These searches give the intra-cluster edges of the abstract graph.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :return: a dictionary mapping each node of the cluster to its search.
+        :rtype: dict.
+        """
+        if cluster not in self.cluster_searches:
+            nodes = set(inside for inside, outside, cost in self.get_transitions(cluster))
+            self.cluster_searches[cluster] = {node: self.search_cluster(cluster, node) for node in nodes}
+        return self.cluster_searches[cluster]
+
+    def get_local_index(self, cluster, index):
+        """
+        Converts the flat index of a cell of the map into its index inside a cluster.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :param index: flat index of the cell in the map.
+        :type index: int.
+        :return: index of the cell inside the cluster.
+        :rtype: int.
+        """
+        top, left, bottom, right = self.get_cluster_bounds(cluster)
+        i, j = divmod(index, self.cost_map.width)
+        return (i - top) * (right - left) + j - left
+
+    def get_local_path(self, cluster, search, target):
+        """
+        Extracts the path from the source of a cluster search to a cell of the cluster.
+
+        :param cluster: the cluster as (row, column).
+        :type cluster: 2-dimensional tuple of int.
+        :param search: the search as returned by search_cluster().
+        :type search: tuple of lists.
+        :param target: flat index of the cell where the path ends.
+        :type target: int.
+        :return: the path as a sequence of (x, y) positions.
+        :rtype: list of tuples.
+        """
+        top, left, bottom, right = self.get_cluster_bounds(cluster)
+        parents = search[1]
+        reversed_path = []
+        local = self.get_local_index(cluster, target)
+        while local >= 0:
+            i, j = divmod(local, right - left)
+            reversed_path.append((top + i, left + j))
+            local = parents[local]
+        return reversed_path[::-1]
+
+    def plan(self, start_position, goal_position):
+        """
+        Plans a path by searching the abstract graph and refining the result inside each crossed cluster.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        self.synchronize()
+        width = self.cost_map.width
+        start = start_position[0] * width + start_position[1]
+        goal = goal_position[0] * width + goal_position[1]
+        start_cluster = self.get_cluster(start)
+        goal_cluster = self.get_cluster(goal)
+        # The start and the goal are temporarily connected to the nodes of their clusters
+        start_search = self.search_cluster(start_cluster, start)
+        goal_search = self.search_cluster(goal_cluster, goal)
+
+        def get_edges(node):
+            cluster = self.get_cluster(node)
+            if node == start:
+                search = start_search
+            else:
+                search = self.get_cluster_searches(cluster)[node]
+            edges = [(outside, cost) for inside, outside, cost in self.get_transitions(cluster) if inside == node]
+            for other in self.get_cluster_searches(cluster):
+                cost = search[0][self.get_local_index(cluster, other)]
+                if other != node and cost < inf:
+                    edges.append((other, cost))
+            if cluster == goal_cluster and goal_search[0][self.get_local_index(cluster, node)] < inf:
+                edges.append((goal, goal_search[0][self.get_local_index(cluster, node)]))
+            return edges
+
+        def heuristic(node):
+            i, j = divmod(node, width)
+            return sqrt((i - goal_position[0]) ** 2 + (j - goal_position[1]) ** 2)
+
+        # A* over the abstract graph
+        g = {start: 0.0}
+        parent = {start: None}
+        closed = set()
+        pq = [(heuristic(start), start)]
+        while pq:
+            f, node = heapq.heappop(pq)
+            if node in closed:
+                continue
+            closed.add(node)
+            if node == goal:
+                break
+            for successor, cost in get_edges(node):
+                if successor not in closed and g[node] + cost < g.get(successor, inf):
+                    g[successor] = g[node] + cost
+                    parent[successor] = node
+                    heapq.heappush(pq, (g[successor] + heuristic(successor), successor))
+        cost = g[goal] if goal in closed else inf
+
+        # Paths between close cells should not be forced through entrance nodes, so they are also searched directly
+        if abs(start_cluster[0] - goal_cluster[0]) <= 1 and abs(start_cluster[1] - goal_cluster[1]) <= 1:
+            start_bounds = self.get_cluster_bounds(start_cluster)
+            goal_bounds = self.get_cluster_bounds(goal_cluster)
+            bounds = (min(start_bounds[0], goal_bounds[0]), min(start_bounds[1], goal_bounds[1]),
+                      max(start_bounds[2], goal_bounds[2]), max(start_bounds[3], goal_bounds[3]))
+            distances, parents = self.search_region(bounds, start)
+            region_width = bounds[3] - bounds[1]
+            local = (goal_position[0] - bounds[0]) * region_width + goal_position[1] - bounds[1]
+            direct_cost = distances[local]
+            if direct_cost < cost:
+                reversed_path = []
+                while local >= 0:
+                    i, j = divmod(local, region_width)
+                    reversed_path.append((bounds[0] + i, bounds[1] + j))
+                    local = parents[local]
+                return reversed_path[::-1], direct_cost
+        if cost == inf:
+            return [], inf
+
+        # Refining the abstract path inside the clusters
+        abstract_path = []
+        node = goal
+        while node is not None:
+            abstract_path.append(node)
+            node = parent[node]
+        abstract_path.reverse()
+        path = [tuple(start_position)]
+        for node, next_node in zip(abstract_path, abstract_path[1:]):
+            cluster = self.get_cluster(node)
+            if cluster != self.get_cluster(next_node):
+                # Inter-cluster edge, which is a single step
+                path.append(divmod(next_node, width))
+            elif next_node == goal:
+                path.extend(self.get_local_path(cluster, goal_search, node)[::-1][1:])
+            elif node == start:
+                path.extend(self.get_local_path(cluster, start_search, next_node)[1:])
+            else:
+                path.extend(self.get_local_path(cluster, self.get_cluster_searches(cluster)[node], next_node)[1:])
+        return path, cost
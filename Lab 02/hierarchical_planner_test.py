@@ -0,0 +1,38 @@
+import math
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+from hierarchical_planner import HierarchicalPlanner
+
+NUM_MAPS = 3
+NUM_ROUNDS = 3  # the map gets new obstacles after each round of problems
+NUM_PROBLEMS = 10  # problems of each round
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+# HPA* paths are near-optimal, since they cross the clusters through their entrances
+MAX_MEAN_COST_RATIO = 1.1
+
+ratios = []
+for seed in range(NUM_MAPS):
+    cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+    path_planner = PathPlanner(cost_map)
+    planner = HierarchicalPlanner(cost_map)
+    for round_number in range(NUM_ROUNDS):
+        for start_position, goal_position in create_problems(cost_map, NUM_PROBLEMS, seed + 10 * round_number):
+            path, cost = planner.plan(start_position, goal_position)
+            expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+            if expected_cost == math.inf:
+                assert cost == math.inf and not path, (start_position, goal_position, cost)
+                continue
+            assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+            path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)])
+            assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (path_cost, cost)
+            assert cost >= expected_cost * (1.0 - COST_TOLERANCE), (start_position, goal_position, cost,
+                                                                    expected_cost)
+            ratios.append(cost / expected_cost)
+        # The clusters touched by the new obstacles are rebuilt by the next plan
+        for obstacle in range(5):
+            cost_map.add_random_obstacle(20, 15)
+mean_ratio = sum(ratios) / len(ratios)
+assert mean_ratio <= MAX_MEAN_COST_RATIO, mean_ratio
+print(r'HPA* paths cost {0:.3f} times the Dijkstra cost on average (at most {1:.3f}) in {2} plans'.format(
+    mean_ratio, max(ratios), len(ratios)))
@@ -0,0 +1,214 @@
+from math import inf, sqrt
+import numpy as np
+import heapq
+
+# Tolerance used to compare keys, since the same key computed through different sums may differ by rounding errors
+KEY_TOLERANCE = 1.0e-9
+
+
+def key_less(key, another_key):
+    """
+    Checks if a key is smaller than another one, comparing their first components with a tolerance.
+
+    :param key: first key.
+    :type key: tuple of float.
+    :param another_key: second key.
+    :type another_key: tuple of float.
+    :return: True if key is smaller than another_key, False otherwise.
+    :rtype: bool.
+    """
+    # Equal components are checked first, since the difference of two infinite components is not a number
+    if key[0] == another_key[0] or abs(key[0] - another_key[0]) <= KEY_TOLERANCE:
+        return key[1] < another_key[1]
+    return key[0] < another_key[0]
+
+
+class DStarLite(object):
+    """
+    Represents an incremental path planner based on D* Lite, which searches from the goal to the start and keeps its
+    search tree between calls, so after the cost of some cells changes only the affected region is repaired.
+    """
+    def __init__(self, cost_map, goal_position):
+        """
+        Creates an incremental path planner for a given cost map and goal.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        """
+        self.cost_map = cost_map
+        self.width = cost_map.width
+        self.height = cost_map.height
+        self.goal = goal_position[0] * self.width + goal_position[1]
+        # g is the cost-to-go of each cell and rhs is its one step lookahead
+        self.g = np.full(self.width * self.height, inf)
+        self.rhs = np.full(self.width * self.height, inf)
+        self.rhs[self.goal] = 0.0
+        # The open list is a heap with lazy deletion, where open_keys holds the valid key of each cell in it
+        self.open_list = []
+        self.open_keys = {}
+        self.key_modifier = 0.0
+        self.start = None
+        self.num_expansions = 0
+
+    def get_neighbors(self, index, reverse=False):
+        """
+        Obtains the 8-connected neighbors of a cell and the costs of the edges to them, with the same costs as
+        CostMapGraph: edges leave occupied cells but do not enter them, so edges entering occupied cells have
+        infinite cost.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :param reverse: if the costs are of the edges from the neighbors to the cell (its predecessors) instead.
+        :type reverse: bool.
+        :return: list of (flat index, edge cost) of the neighbors.
+        :rtype: list of tuples.
+        """
+        grid = self.cost_map.grid
+        i, j = divmod(index, self.width)
+        cost = grid[i, j]
+        neighbors = []
+        for di in range(-1, 2):
+            for dj in range(-1, 2):
+                if (di != 0 or dj != 0) and 0 <= i + di < self.height and 0 <= j + dj < self.width:
+                    next_cost = grid[i + di, j + dj]
+                    if (cost if reverse else next_cost) < 0.0:
+                        edge_cost = inf
+                    else:
+                        factor = sqrt(2) if di != 0 and dj != 0 else 1.0
+                        edge_cost = factor * (cost + next_cost) / 2.0
+                    neighbors.append((index + di * self.width + dj, edge_cost))
+        return neighbors
+
+    def heuristic(self, index):
+        """
+        Computes the euclidean distance between the start and a cell.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: euclidean distance between the start and the cell.
+        :rtype: float.
+        """
+        i, j = divmod(index, self.width)
+        start_i, start_j = divmod(self.start, self.width)
+        return sqrt((i - start_i) ** 2 + (j - start_j) ** 2)
+
+    def calculate_key(self, index):
+        """
+        Calculates the key used to sort a cell in the open list.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: key of the cell.
+        :rtype: tuple of float.
+        """
+        cost = min(self.g[index], self.rhs[index])
+        # The first step out of an occupied start may cost nothing, so the distance of a diagonal step is discounted
+        # to keep the heuristic consistent
+        return cost + max(self.heuristic(index) - sqrt(2), 0.0) + self.key_modifier, cost
+
+    def update_vertex(self, index):
+        """
+        Recomputes the lookahead of a cell and updates its membership in the open list.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        """
+        if index != self.goal:
+            self.rhs[index] = min([edge_cost + self.g[neighbor] for neighbor, edge_cost in self.get_neighbors(index)])
+        if self.g[index] != self.rhs[index]:
+            key = self.calculate_key(index)
+            self.open_keys[index] = key
+            heapq.heappush(self.open_list, (key, index))
+        else:
+            self.open_keys.pop(index, None)
+
+    def get_top_key(self):
+        """
+        Obtains the smallest key of the open list, discarding outdated entries.
+
+        :return: the smallest key of the open list, or (inf, inf) if it is empty.
+        :rtype: tuple of float.
+        """
+        while self.open_list:
+            key, index = self.open_list[0]
+            if self.open_keys.get(index) == key:
+                return key
+            heapq.heappop(self.open_list)
+        return inf, inf
+
+    def compute_shortest_path(self):
+        """
+        Expands inconsistent cells until the cost-to-go of the start is known.
+        """
+        while key_less(self.get_top_key(), self.calculate_key(self.start)) or self.rhs[self.start] != self.g[self.start]:
+            old_key, index = heapq.heappop(self.open_list)
+            new_key = self.calculate_key(index)
+            self.num_expansions += 1
+            if key_less(old_key, new_key):
+                # The key is outdated because the start has moved
+                self.open_keys[index] = new_key
+                heapq.heappush(self.open_list, (new_key, index))
+            elif self.g[index] > self.rhs[index]:
+                # Overconsistent cell: its cost-to-go decreased
+                self.g[index] = self.rhs[index]
+                del self.open_keys[index]
+                for neighbor, edge_cost in self.get_neighbors(index, reverse=True):
+                    if neighbor != self.goal and edge_cost + self.g[index] < self.rhs[neighbor]:
+                        self.rhs[neighbor] = edge_cost + self.g[index]
+                        self.update_vertex(neighbor)
+            else:
+                # Underconsistent cell: its cost-to-go increased, so it and its neighbors must be recomputed
+                self.g[index] = inf
+                self.update_vertex(index)
+                for neighbor, edge_cost in self.get_neighbors(index):
+                    self.update_vertex(neighbor)
+
+    def update_cells(self, changed):
+        """
+        Notifies the planner that the cost of some cells has changed in the cost map.
+
+        :param changed: positions of the changed cells as tuples (x, y).
+        :type changed: iterable of tuples.
+        """
+        affected = set()
+        for i, j in changed:
+            index = i * self.width + j
+            affected.add(index)
+            for neighbor, edge_cost in self.get_neighbors(index):
+                affected.add(neighbor)
+        if self.start is None:
+            # Nothing was planned yet, so the first call to replan() will take the changes into account
+            return
+        for index in affected:
+            self.update_vertex(index)
+
+    def replan(self, start_position):
+        """
+        Plans a path from a start position to the goal, reusing the search effort of previous calls.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        start = start_position[0] * self.width + start_position[1]
+        if self.start is None:
+            self.start = start
+            self.open_keys[self.goal] = self.calculate_key(self.goal)
+            heapq.heappush(self.open_list, (self.open_keys[self.goal], self.goal))
+        elif start != self.start:
+            # Instead of reordering the open list, the keys are offset by how much the heuristic may have decreased
+            self.key_modifier += self.heuristic(start)
+            self.start = start
+        self.compute_shortest_path()
+        cost = self.g[self.start]
+        if cost == inf:
+            return [], inf
+        path = [tuple(start_position)]
+        index = self.start
+        while index != self.goal:
+            index = min(self.get_neighbors(index), key=lambda neighbor: neighbor[1] + self.g[neighbor[0]])[0]
+            path.append(divmod(index, self.width))
+        return path, float(cost)
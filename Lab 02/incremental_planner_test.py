@@ -0,0 +1,44 @@
+import math
+import random
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+from incremental_planner import DStarLite
+
+NUM_MAPS = 3
+NUM_PROBLEMS = 5  # problems of each map
+NUM_EDITS = 4  # obstacles added while the robot follows each path
+STEPS_PER_EDIT = 10  # cells the robot moves along its path before each obstacle is added
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+
+num_plans = 0
+for seed in range(NUM_MAPS):
+    rng = random.Random(seed)
+    problems = create_problems(create_cost_map(160, 120, 20, 15, 20, seed), NUM_PROBLEMS, seed)
+    for start_position, goal_position in problems:
+        # Every problem edits its own copy of the map
+        cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+        path_planner = PathPlanner(cost_map)
+        planner = DStarLite(cost_map, goal_position)
+        for edit in range(NUM_EDITS + 1):
+            path, cost = planner.replan(start_position)
+            expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+            assert math.isclose(cost, expected_cost, rel_tol=COST_TOLERANCE), (start_position, goal_position, cost,
+                                                                              expected_cost)
+            if path:
+                assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+                path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)])
+                assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (path_cost, cost)
+            num_plans += 1
+            if edit == NUM_EDITS or len(path) <= STEPS_PER_EDIT:
+                break
+            # The robot moves along the path and sees an obstacle close to it, which may even cover it
+            start_position = path[STEPS_PER_EDIT]
+            version = cost_map.version
+            cost_map.add_obstacle((start_position[1] + rng.randint(-8, 8), start_position[0] + rng.randint(-8, 8),
+                                   rng.randint(1, 6), rng.randint(1, 6)))
+            changed = []
+            for top, left, bottom, right in cost_map.get_edits_since(version):
+                changed.extend([(i, j) for i in range(top, bottom) for j in range(left, right)])
+            planner.update_cells(changed)
+print(r'D* Lite matches Dijkstra in {0} plans'.format(num_plans))
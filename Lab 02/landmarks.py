@@ -0,0 +1,148 @@
+from path_planner import PathPlanner
+from math import inf
+import numpy as np
+import random
+
+
+class LandmarkHeuristic(object):
+    """
+    Represents an ALT (A*, Landmarks and Triangle inequality) heuristic of a cost map. The distance fields of a
+    few landmarks are computed once, then the cost between any two cells n and g is bounded from below by
+    |d(L, n) - d(L, g)| for every landmark L. Adding obstacles only increases the edge costs, so the bounds
+    remain admissible after the map changes, although they become weaker.
+    """
+    def __init__(self, cost_map, num_landmarks=8, seed=0, distances=None, landmarks=None):
+        """
+        Creates the landmark heuristic of a cost map, computing the distance fields of the landmarks unless
+        they are given.
+
+        :param cost_map: cost map used for planning.
+        :type cost_map: CostMap.
+        :param num_landmarks: number of landmarks.
+        :type num_landmarks: int.
+        :param seed: seed of the random number generator which chooses the cell where the selection starts.
+        :type seed: int.
+        :param distances: precomputed distance fields, one column per landmark.
+        :type distances: numpy array of shape (height * width, num_landmarks).
+        :param landmarks: positions of the precomputed landmarks.
+        :type landmarks: list of tuples.
+        """
+        self.cost_map = cost_map
+        if distances is None:
+            landmarks, distances = self.select_landmarks(num_landmarks, seed)
+        self.landmarks = [tuple(landmark) for landmark in landmarks]
+        # Row n holds the cost between cell n and every landmark, so a single read gives all the bounds of a cell
+        self.distances = distances
+        # Largest rounding error of a bound, since each one is a difference of two float32 costs
+        finite = distances[distances < inf]
+        self.tolerance = 0.0
+        if np.size(finite) > 0:
+            self.tolerance = 2.0 * float(np.finfo(np.float32).eps) * float(np.max(finite))
+
+    def select_landmarks(self, num_landmarks, seed):
+        """
+        Chooses the landmarks by farthest point sampling: each landmark is the cell whose cost to the closest
+        landmark already chosen is the largest, so the landmarks end up spread along the borders of the map.
+
+        :param num_landmarks: number of landmarks.
+        :type num_landmarks: int.
+        :param seed: seed of the random number generator which chooses the cell where the selection starts.
+        :type seed: int.
+        :return: the positions of the landmarks and their distance fields.
+        :rtype: list of tuples and numpy array of shape (height * width, num_landmarks).
+        """
+        cost_map = self.cost_map
+        path_planner = PathPlanner(cost_map)
+        free = np.flatnonzero(cost_map.grid.ravel() >= 0.0)
+        if np.size(free) == 0:
+            raise ValueError('The cost map has no free cells')
+        rng = random.Random(seed)
+        position = divmod(int(free[rng.randrange(np.size(free))]), cost_map.width)
+        # The first landmark is the farthest cell from a random one, which is not a landmark itself
+        closest = path_planner.compute_distance_field(position).ravel()
+        landmarks = []
+        distances = np.empty((cost_map.height * cost_map.width, num_landmarks), dtype=np.float32)
+        for k in range(num_landmarks):
+            # Cells which can not be reached from the landmarks already chosen are not candidates
+            candidates = np.where(closest < inf, closest, -1.0)
+            position = divmod(int(np.argmax(candidates)), cost_map.width)
+            field = path_planner.compute_distance_field(position).ravel()
+            landmarks.append(position)
+            distances[:, k] = field
+            closest = field if k == 0 else np.minimum(closest, field)
+        return landmarks, distances
+
+    def get_estimator(self, goal_position):
+        """
+        Obtains the heuristic function of a goal.
+
+        :param goal_position: goal position as a tuple (x, y).
+        :type goal_position: tuple.
+        :return: function which bounds from below the cost from a cell (given by its flat index) to the goal.
+        :rtype: function.
+        """
+        width = self.cost_map.width
+        goal_i, goal_j = goal_position
+        goal_distances = self.distances[goal_i * width + goal_j]
+        # Landmarks which can not reach the goal give no bound for the cells which can reach it
+        usable = goal_distances < inf
+        if np.all(usable):
+            distances = self.distances
+        else:
+            distances = self.distances[:, usable]
+            goal_distances = goal_distances[usable]
+        has_landmarks = np.size(goal_distances) > 0
+        tolerance = self.tolerance
+        # The bounds are computed one row of the map at a time, when a cell of the row is first needed, since a
+        # vectorized row costs about as much as a few cells computed one by one
+        rows = {}
+        columns = np.arange(width)
+
+        def compute_row(i):
+            bounds = np.sqrt((i - goal_i) ** 2 + (columns - goal_j) ** 2)
+            if has_landmarks:
+                row_distances = distances[i * width:(i + 1) * width]
+                # Shrinking the bounds by the rounding error, so they never exceed the exact cost
+                with np.errstate(invalid='ignore'):
+                    landmark_bounds = np.max(np.abs(row_distances - goal_distances), axis=1) - tolerance
+                # Cells which can not reach the goal have infinite bounds, which are never used
+                bounds = np.fmax(bounds, landmark_bounds)
+            rows[i] = bounds.tolist()
+            return rows[i]
+
+        def estimate(index):
+            i, j = divmod(index, width)
+            row = rows.get(i)
+            if row is None:
+                row = compute_row(i)
+            return row[j]
+
+        return estimate
+
+    def save(self, filename):
+        """
+        Saves the landmarks and their distance fields to disk.
+
+        :param filename: name of the file (.npz).
+        :type filename: str.
+        """
+        np.savez_compressed(filename, landmarks=np.array(self.landmarks, dtype=np.int32),
+                            distances=self.distances, shape=np.array([self.cost_map.height, self.cost_map.width]))
+
+    @staticmethod
+    def load(cost_map, filename):
+        """
+        Loads the landmarks and their distance fields from disk.
+
+        :param cost_map: cost map for which the landmarks were computed.
+        :type cost_map: CostMap.
+        :param filename: name of the file (.npz).
+        :type filename: str.
+        :return: the landmark heuristic.
+        :rtype: LandmarkHeuristic.
+        """
+        with np.load(filename) as data:
+            if tuple(data['shape']) != (cost_map.height, cost_map.width):
+                raise ValueError('The landmarks were computed for a cost map of another size')
+            landmarks = [tuple(landmark) for landmark in data['landmarks'].tolist()]
+            return LandmarkHeuristic(cost_map, len(landmarks), distances=data['distances'], landmarks=landmarks)
@@ -0,0 +1,31 @@
+import math
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+from landmarks import LandmarkHeuristic
+
+NUM_MAPS = 3
+NUM_ROUNDS = 2  # the map gets new obstacles after each round of problems, but keeps its landmarks
+NUM_PROBLEMS = 10  # problems of each round
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+
+num_plans = 0
+for seed in range(NUM_MAPS):
+    cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+    path_planner = PathPlanner(cost_map)
+    heuristic = LandmarkHeuristic(cost_map, seed=seed)
+    for round_number in range(NUM_ROUNDS):
+        for start_position, goal_position in create_problems(cost_map, NUM_PROBLEMS, seed + 10 * round_number):
+            expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+            path, cost = path_planner.a_star(start_position, goal_position, heuristic=heuristic)
+            assert math.isclose(cost, expected_cost, rel_tol=COST_TOLERANCE), (start_position, goal_position, cost,
+                                                                              expected_cost)
+            if path:
+                assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+                path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1]) for k in range(len(path) - 1)])
+                assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (path_cost, cost)
+            num_plans += 1
+        # New obstacles only make the bounds of the landmarks weaker, so they remain admissible
+        for obstacle in range(5):
+            cost_map.add_random_obstacle(20, 15)
+print(r'A* with landmarks matches Dijkstra in {0} plans'.format(num_plans))
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from path_planner import PathPlanner
 from grid import CostMap
+from search_stats import SearchStats
 from math import inf
 import random
 import time
@@ -16,6 +17,9 @@ num_iterations = 1
 # num_iterations = 10
 # num_iterations = 100  # Monte Carlo
 
+# Search statistics options
+report_stats = False  # if the search statistics will be reported with the compute time statistics
+
 # Plot options
 save_fig = True  # if the figure will be used to the hard disk
 show_fig = True  # if the figure will be shown in the screen
@@ -84,6 +88,9 @@ path_planner = PathPlanner(cost_map)
 # so we may compute mean and standard deviation statistics in the Monte Carlo analysis.
 times = np.zeros((num_iterations, 1))
 costs = np.zeros((num_iterations, 1))
+# Statistics of each search, only collected when they are reported
+stats = SearchStats() if report_stats else None
+search_stats = []
 for i in range(num_iterations):
     problem_valid = False
     while not problem_valid:
@@ -99,18 +106,24 @@ for i in range(num_iterations):
         if start_position == goal_position:
             continue
         problem_valid = True
+    # Unreachable problems are kept, so a seed produces the same problems, and rejected by the planners in O(1)
+    if not cost_map.is_reachable(start_position, goal_position):
+        print('Problem {0}: the goal {1} can not be reached from the start {2}'.format(i, goal_position,
+                                                                                        start_position))
     tic = time.time()
     if algorithm == 'dijkstra':
-        path, cost = path_planner.dijkstra(start_position, goal_position)
+        path, cost = path_planner.dijkstra(start_position, goal_position, stats=stats)
     elif algorithm == 'greedy':
-        path, cost = path_planner.greedy(start_position, goal_position)
+        path, cost = path_planner.greedy(start_position, goal_position, stats=stats)
     else:
-        path, cost = path_planner.a_star(start_position, goal_position)
+        path, cost = path_planner.a_star(start_position, goal_position, stats=stats)
     # if path is not None and len(path) > 0:
     path_found = True
     toc = time.time()
     times[i] = toc - tic
     costs[i] = cost
+    if report_stats:
+        search_stats.append(stats.to_dict())
     plot_path(cost_map, start_position, goal_position, path, '%s_%d' % (algorithm, i), save_fig, show_fig, fig_format)
 
 
@@ -118,3 +131,8 @@ for i in range(num_iterations):
 print(r'Compute time: mean: {0}, std: {1}'.format(np.mean(times), np.std(times)))
 if not (inf in costs):
     print(r'Cost: mean: {0}, std: {1}'.format(np.mean(costs), np.std(costs)))
+if report_stats:
+    for name in ['expansions', 'pushes', 'stale_pops', 'peak_open_size', 'reset_time', 'expansion_time',
+                 'reconstruction_time']:
+        values = [search_stat[name] for search_stat in search_stats]
+        print(r'{0}: mean: {1}, std: {2}'.format(name, np.mean(values), np.std(values)))
@@ -0,0 +1,143 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+import numpy as np
+from grid import ConnectedComponents
+from path_planner import PathPlanner
+from memory_bounded_planner import MemoryBoundedPlanner
+from benchmark import create_cost_map
+
+ALGORITHMS = ['a_star', 'ida_star']
+# Margin around the start and the goal of the window where they must be connected
+WINDOW_MARGIN = 50
+
+
+def create_local_problems(cost_map, num_problems, max_distance, seed):
+    """
+    Samples planning problems whose goal is at most max_distance rows and columns away from the start and
+    connected to it inside a window around both, so every problem is solvable without labeling the whole map.
+
+    :param cost_map: cost map used for planning.
+    :type cost_map: CostMap.
+    :param num_problems: number of problems.
+    :type num_problems: int.
+    :param max_distance: largest difference between the rows (and the columns) of the start and of the goal.
+    :type max_distance: int.
+    :param seed: seed of the random number generator.
+    :type seed: int.
+    :return: list of (start, goal) positions.
+    :rtype: list of tuples.
+    """
+    rng = random.Random(seed)
+    problems = []
+    while len(problems) < num_problems:
+        start_position = (rng.randint(0, cost_map.height - 1), rng.randint(0, cost_map.width - 1))
+        goal_position = (min(max(start_position[0] + rng.randint(-max_distance, max_distance), 0), cost_map.height - 1),
+                         min(max(start_position[1] + rng.randint(-max_distance, max_distance), 0), cost_map.width - 1))
+        if cost_map.is_occupied(start_position[0], start_position[1]):
+            continue
+        if cost_map.is_occupied(goal_position[0], goal_position[1]):
+            continue
+        if start_position == goal_position:
+            continue
+        top = max(min(start_position[0], goal_position[0]) - WINDOW_MARGIN, 0)
+        left = max(min(start_position[1], goal_position[1]) - WINDOW_MARGIN, 0)
+        bottom = min(max(start_position[0], goal_position[0]) + WINDOW_MARGIN + 1, cost_map.height)
+        right = min(max(start_position[1], goal_position[1]) + WINDOW_MARGIN + 1, cost_map.width)
+        labels = ConnectedComponents.label(cost_map.grid[top:bottom, left:right] >= 0.0)
+        if labels[start_position[0] - top, start_position[1] - left] != labels[goal_position[0] - top,
+                                                                                goal_position[1] - left]:
+            continue
+        problems.append((start_position, goal_position))
+    return problems
+
+
+def run_planner(cost_map, algorithm, problems, table_size):
+    """
+    Creates a planner and solves the problems with it.
+
+    :param cost_map: cost map used for planning.
+    :type cost_map: CostMap.
+    :param algorithm: 'a_star' (PathPlanner) or 'ida_star' (MemoryBoundedPlanner).
+    :type algorithm: str.
+    :param problems: list of (start, goal) positions.
+    :type problems: list of tuples.
+    :param table_size: size of the transposition table of IDA*.
+    :type table_size: int.
+    :return: time spent creating the planner and the cost, time and expansions of each problem.
+    :rtype: float and list of dict.
+    """
+    # Data derived from the map is part of the cost of the planner
+    cost_map.graph = None
+    cost_map.components = None
+    tic = time.perf_counter()
+    if algorithm == 'a_star':
+        path_planner = PathPlanner(cost_map)
+        cost_map.get_graph()
+        cost_map.get_components()
+    else:
+        path_planner = MemoryBoundedPlanner(cost_map, table_size)
+        # Unreachable goals are rejected using the connected components
+        cost_map.get_components()
+    setup_time = time.perf_counter() - tic
+    results = []
+    for start_position, goal_position in problems:
+        tic = time.perf_counter()
+        if algorithm == 'a_star':
+            path, cost = path_planner.a_star(start_position, goal_position)
+            expansions = path_planner.node_grid.count_closed()
+        else:
+            path, cost = path_planner.plan(start_position, goal_position)
+            expansions = path_planner.num_expansions
+        results.append({'cost': cost, 'time': time.perf_counter() - tic, 'expansions': expansions})
+    return setup_time, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time and memory of A* and of the memory-bounded IDA* planner.')
+    parser.add_argument('--size', type=int, default=4000, help='width and height of the map')
+    parser.add_argument('--num-obstacles', type=int, default=None,
+                        help='number of 20x15 obstacles (by default, the density of main.py)')
+    parser.add_argument('--map-seed', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=0, help='seed used to sample the start and goal positions')
+    parser.add_argument('--queries', type=int, default=5)
+    parser.add_argument('--max-distance', type=int, default=100,
+                        help='largest row and column difference between the start and the goal')
+    parser.add_argument('--long-range', action='store_true',
+                        help='samples the start and the goal anywhere on the map (overrides --max-distance)')
+    parser.add_argument('--table-size', type=int, default=1 << 18, help='transposition table size of IDA*')
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument('--output', default='memory_benchmark.json')
+    args = parser.parse_args()
+
+    num_obstacles = args.num_obstacles
+    if num_obstacles is None:
+        num_obstacles = round(20 * args.size * args.size / (160 * 120))
+    cost_map = create_cost_map(args.size, args.size, 20, 15, num_obstacles, args.map_seed)
+    # Long-range problems are connected inside a window which covers the whole map
+    max_distance = args.size if args.long_range else args.max_distance
+    problems = create_local_problems(cost_map, args.queries, max_distance, args.seed)
+    report = {'parameters': vars(args), 'map_bytes': cost_map.grid.nbytes, 'algorithms': {}}
+    for algorithm in args.algorithms:
+        setup_time, results = run_planner(cost_map, algorithm, problems, args.table_size)
+        # The memory is measured in a second run, since tracing the allocations slows the planners down
+        tracemalloc.start()
+        run_planner(cost_map, algorithm, problems, args.table_size)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report['algorithms'][algorithm] = {'setup_time': setup_time, 'peak_memory': peak_memory,
+                                           'time_mean': float(np.mean([result['time'] for result in results])),
+                                           'expansions_mean': float(np.mean([result['expansions']
+                                                                              for result in results])),
+                                           'queries': results}
+        print(r'{0}: setup time: {1} s, peak memory: {2} MB, query time: mean: {3} s, expansions: mean: {4}'.format(
+            algorithm, setup_time, peak_memory / 1e6, report['algorithms'][algorithm]['time_mean'],
+            report['algorithms'][algorithm]['expansions_mean']))
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+import heapq
+
+# Number of radix heap keys per unit of cost
+RADIX_SCALE = 1024.0
+
+
+class HeapOpenList(object):
+    """
+    Represents an open list based on a binary heap (heapq). A cell whose priority improves is pushed again,
+    so the outdated entries must be skipped by the search when they are popped.
+    """
+    def __init__(self):
+        """
+        Creates an empty open list.
+        """
+        self.heap = []
+
+    def push(self, priority, index):
+        """
+        Inserts a cell in the open list.
+
+        :param priority: priority of the cell (lower values are popped first).
+        :type priority: float.
+        :param index: flat index of the cell.
+        :type index: int.
+        """
+        heapq.heappush(self.heap, (priority, index))
+
+    def pop(self):
+        """
+        Removes the cell with the lowest priority from the open list.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        return heapq.heappop(self.heap)
+
+    def peek(self):
+        """
+        Obtains the cell with the lowest priority without removing it.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        return self.heap[0]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class RadixHeapOpenList(object):
+    """
+    Represents an open list based on a monotone radix heap. Priorities are quantized into integer keys and each
+    entry is kept in the bucket given by the highest bit in which its key differs from the last popped key.
+    Entries with the same key as the last popped one are ordered by their exact priority, so the order is the
+    same as the one of a binary heap. Priorities must never be lower than the last popped one, which holds
+    for the Dijkstra algorithm and A* with a consistent heuristic, but not for greedy search.
+    """
+    def __init__(self):
+        """
+        Creates an empty open list.
+        """
+        # The first bucket holds the entries whose key is the last popped key, as a heap of (priority, index)
+        self.buckets = [[] for i in range(65)]
+        self.last_key = 0
+        self.size = 0
+
+    def push(self, priority, index):
+        """
+        Inserts a cell in the open list.
+
+        :param priority: priority of the cell (lower values are popped first).
+        :type priority: float.
+        :param index: flat index of the cell.
+        :type index: int.
+        """
+        key = int(priority * RADIX_SCALE)
+        if key <= self.last_key:
+            # A key one unit below the last one comes from rounding errors of an otherwise monotone priority
+            if key < self.last_key - 1:
+                raise ValueError('The radix heap requires monotone priorities')
+            heapq.heappush(self.buckets[0], (priority, index))
+        else:
+            self.buckets[(key ^ self.last_key).bit_length()].append((key, priority, index))
+        self.size += 1
+
+    def pop(self):
+        """
+        Removes the cell with the lowest priority from the open list.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        self.refill()
+        self.size -= 1
+        return heapq.heappop(self.buckets[0])
+
+    def peek(self):
+        """
+        Obtains the cell with the lowest priority without removing it.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        self.refill()
+        return self.buckets[0][0]
+
+    def refill(self):
+        """
+        Makes sure the first bucket holds the cell with the lowest priority, unless the open list is empty.
+        """
+        if not self.buckets[0] and self.size > 0:
+            # Redistributing the first non-empty bucket, whose smallest key becomes the last key
+            bucket = 1
+            while not self.buckets[bucket]:
+                bucket += 1
+            entries = self.buckets[bucket]
+            self.buckets[bucket] = []
+            self.last_key = min(entries)[0]
+            for key, priority, index in entries:
+                if key == self.last_key:
+                    heapq.heappush(self.buckets[0], (priority, index))
+                else:
+                    self.buckets[(key ^ self.last_key).bit_length()].append((key, priority, index))
+
+    def __len__(self):
+        return self.size
+
+
+class IndexedHeapOpenList(object):
+    """
+    Represents an open list based on a binary heap which knows the position of each cell, so the priority of a
+    cell already in the heap is decreased in place instead of inserting a duplicate.
+    """
+    def __init__(self):
+        """
+        Creates an empty open list.
+        """
+        self.heap = []
+        self.positions = {}
+
+    def push(self, priority, index):
+        """
+        Inserts a cell in the open list, or decreases its priority if it is already there.
+
+        :param priority: priority of the cell (lower values are popped first).
+        :type priority: float.
+        :param index: flat index of the cell.
+        :type index: int.
+        """
+        position = self.positions.get(index)
+        if position is None:
+            position = len(self.heap)
+            self.heap.append((priority, index))
+        elif priority < self.heap[position][0]:
+            self.heap[position] = (priority, index)
+        else:
+            return
+        self.sift_up(position)
+
+    def pop(self):
+        """
+        Removes the cell with the lowest priority from the open list.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        heap = self.heap
+        top = heap[0]
+        del self.positions[top[1]]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.sift_down(0)
+        return top
+
+    def peek(self):
+        """
+        Obtains the cell with the lowest priority without removing it.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        return self.heap[0]
+
+    def sift_up(self, position):
+        """
+        Moves an entry up the heap until its parent has a lower priority.
+
+        :param position: position of the entry in the heap.
+        :type position: int.
+        """
+        heap = self.heap
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if heap[parent] <= entry:
+                break
+            heap[position] = heap[parent]
+            self.positions[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        self.positions[entry[1]] = position
+
+    def sift_down(self, position):
+        """
+        Moves an entry down the heap until its children have higher priorities.
+
+        :param position: position of the entry in the heap.
+        :type position: int.
+        """
+        heap = self.heap
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[position] = heap[child]
+            self.positions[heap[position][1]] = position
+            position = child
+        heap[position] = entry
+        self.positions[entry[1]] = position
+
+    def __len__(self):
+        return len(self.heap)
+
+
+# Open lists which may be selected by the planners
+OPEN_LISTS = {'heap': HeapOpenList, 'radix': RadixHeapOpenList, 'indexed': IndexedHeapOpenList}
@@ -1,20 +1,41 @@
-from grid import Node, NodeGrid
-from math import inf
+from grid import CostMapGraph, Node, NodeGrid, SearchState, SparseSearchState
+from open_list import OPEN_LISTS
+from math import inf, sqrt
 import heapq
+import multiprocessing
+
+# Algorithms which always return optimal paths, so problems sharing a start or a goal may share a search
+OPTIMAL_ALGORITHMS = ['dijkstra', 'a_star', 'jps', 'bidirectional_dijkstra', 'bidirectional_a_star']
+# Smallest group solved with a shared search, since the optimal algorithm alone is faster for fewer problems
+MIN_GROUP_SIZE = 2
 
 class PathPlanner(object):
     """
     Represents a path planner, which may use Dijkstra, Greedy Search or A* to plan a path.
     """
-    def __init__(self, cost_map):
+    def __init__(self, cost_map, engine='array'):
         """
         Creates a new path planner for a given cost map.
 
         :param cost_map: cost used in this path planner.
         :type cost_map: CostMap.
+        :param engine: search state used by the planner: 'array' (flat arrays with O(1) reset), 'sparse' (only the
+            cells touched by the search, for maps which do not fit in memory such as a TiledCostMap) or 'node'
+            (one Node per cell).
+        :type engine: str.
         """
         self.cost_map = cost_map
-        self.node_grid = NodeGrid(cost_map)
+        self.engine = engine
+        # Search state of the backward half of the bidirectional searches, only created when needed
+        self.backward_state = None
+        if engine == 'array':
+            self.node_grid = SearchState(cost_map)
+        elif engine == 'sparse':
+            self.node_grid = SparseSearchState(cost_map)
+        elif engine == 'node':
+            self.node_grid = NodeGrid(cost_map)
+        else:
+            raise ValueError('Unknown search engine: %s' % engine)
 
     @staticmethod
     def construct_path(goal_node):
@@ -35,7 +56,131 @@ class PathPlanner(object):
             node = node.parent
         return reversed_path[::-1]  # This syntax creates the reverse list
 
-    def dijkstra(self, start_position, goal_position):
+    def _search(self, start_position, goal_position, g_weight, h_weight, open_list='heap', stats=None,
+                heuristic=None):
+        """
+        Plans a path with a best-first search over the array-backed search state, where the open list
+        is ordered by g_weight * g(n) + h_weight * h(n).
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y), or None to expand the whole map.
+        :type goal_position: tuple.
+        :param g_weight: weight of the cost-to-come in the priority.
+        :type g_weight: float.
+        :param h_weight: weight of the heuristic (euclidean distance to the goal) in the priority.
+        :type h_weight: float.
+        :param open_list: open list used by the search ('heap', 'radix' or 'indexed').
+        :type open_list: str.
+        :param stats: statistics filled in by the search, or None to disable them.
+        :type stats: SearchStats.
+        :param heuristic: heuristic used instead of the euclidean distance to the goal, or None.
+        :type heuristic: LandmarkHeuristic.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        state = self.node_grid
+        if stats is not None:
+            stats.clear()
+            stats.start()
+        state.reset()
+        if stats is not None:
+            stats.reset_time = stats.stop()
+        if goal_position is not None and not self.cost_map.is_reachable(start_position, goal_position):
+            # The goal is in another connected component, so the search would only exhaust the reachable region
+            if stats is not None:
+                # Nothing is expanded, so the statistics are the ones of an empty search
+                stats.finish(stats.instrument(OPEN_LISTS[open_list]()), state)
+            return [], inf
+        # Binding the arrays to local variables, since this loop is the bottleneck of the planner
+        g = state.g
+        f = state.f
+        parent = state.parent
+        stamp = state.stamp
+        closed = state.closed
+        generation = state.generation
+        width = state.width
+        get_successors = self.cost_map.get_graph().get_successor_lists
+        if goal_position is None:
+            # No cell has this index, so the search only stops when the open list is empty
+            goal_i, goal_j = start_position
+            goal = -1
+        else:
+            goal_i, goal_j = goal_position
+            goal = state.get_index(goal_i, goal_j)
+        start = state.get_index(start_position[0], start_position[1])
+        estimate = heuristic.get_estimator((goal_i, goal_j)) if heuristic is not None else None
+
+        stamp[start] = generation
+        g[start] = 0.0
+        if estimate is not None:
+            f[start] = h_weight * estimate(start)
+        else:
+            f[start] = h_weight * sqrt((start_position[0] - goal_i) ** 2 + (start_position[1] - goal_j) ** 2)
+        parent[start] = -1
+        pq = OPEN_LISTS[open_list]()
+        if stats is not None:
+            # Only the open list is instrumented, so the loop itself is the same with or without statistics
+            pq = stats.instrument(pq)
+            stats.start()
+        push = pq.push
+        pop = pq.pop
+        push(f[start], start)
+        found = False
+        while pq:
+            current_f, current = pop()
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            if current == goal:
+                found = True
+                break
+            current_g = float(g[current])
+            successors, successor_costs = get_successors(current)
+            for successor, edge_cost in zip(successors, successor_costs):
+                if closed[successor] == generation:
+                    continue
+                new_g = current_g + edge_cost
+                if stamp[successor] != generation or new_g < g[successor]:
+                    stamp[successor] = generation
+                    g[successor] = new_g
+                    f[successor] = g_weight * new_g
+                    if h_weight:
+                        if estimate is not None:
+                            f[successor] += h_weight * estimate(successor)
+                        else:
+                            i_next, j_next = divmod(successor, width)
+                            f[successor] += h_weight * sqrt((i_next - goal_i) ** 2 + (j_next - goal_j) ** 2)
+                    parent[successor] = current
+                    push(f[successor], successor)
+        if stats is None:
+            if found:
+                return state.construct_path(goal), float(g[goal])
+            # if no path to the goal was found
+            return [], inf
+        stats.expansion_time = stats.stop()
+        stats.finish(pq, state)
+        stats.start()
+        path = state.construct_path(goal) if found else []
+        stats.reconstruction_time = stats.stop()
+        return path, float(g[goal]) if found else inf
+
+    def compute_distance_field(self, position):
+        """
+        Computes the cost of the optimal path between a position and every cell of the map using the Dijkstra algorithm.
+        Since the edge costs are symmetric, this is also the cost-to-go from every cell to the position.
+
+        :param position: position where the distance field is rooted as a tuple (x, y).
+        :type position: tuple.
+        :return: the cost of every cell (inf for cells which can not be reached).
+        :rtype: numpy array of shape (height, width).
+        """
+        if self.engine != 'array':
+            raise ValueError('Distance fields require the array engine')
+        self._search(position, None, 1.0, 0.0)
+        return self.node_grid.get_distances().reshape(self.cost_map.height, self.cost_map.width)
+
+    def dijkstra(self, start_position, goal_position, open_list='heap', stats=None):
         """
         Plans a path using the Dijkstra algorithm.
 
@@ -43,9 +188,18 @@ class PathPlanner(object):
         :type start_position: tuple.
         :param goal_position: goal position of the planning as a tuple (x, y).
         :type goal_position: tuple.
+        :param open_list: open list used by the array and sparse engines ('heap', 'radix' or 'indexed').
+        :type open_list: str.
+        :param stats: statistics filled in by the array and sparse engines, or None to disable them.
+        :type stats: SearchStats.
         :return: the path as a sequence of positions and the path cost.
         :rtype: list of tuples and float.
         """
+        if self.engine != 'node':
+            return self._search(start_position, goal_position, 1.0, 0.0, open_list, stats)
+        if stats is not None:
+            raise ValueError('Search statistics require the array or sparse engine')
+
 		# Todo: implement the Dijkstra algorithm
 		# The first return is the path as sequence of tuples (as returned by the method construct_path())
 		# The second return is the cost of the path
@@ -105,7 +259,7 @@ class PathPlanner(object):
         # if no path to the goal was found
         return [], inf
 
-    def greedy(self, start_position, goal_position):
+    def greedy(self, start_position, goal_position, open_list='heap', stats=None):
         """
         Plans a path using greedy search.
 
@@ -113,9 +267,20 @@ class PathPlanner(object):
         :type start_position: tuple.
         :param goal_position: goal position of the planning as a tuple (x, y).
         :type goal_position: tuple.
+        :param open_list: open list used by the array and sparse engines ('heap', 'radix' or 'indexed').
+        :type open_list: str.
+        :param stats: statistics filled in by the array and sparse engines, or None to disable them.
+        :type stats: SearchStats.
         :return: the path as a sequence of positions and the path cost.
         :rtype: list of tuples and float.
         """
+        if self.engine != 'node':
+            if open_list == 'radix':
+                raise ValueError('The radix heap requires monotone priorities, which greedy search does not have')
+            return self._search(start_position, goal_position, 0.0, 1.0, open_list, stats)
+        if stats is not None:
+            raise ValueError('Search statistics require the array or sparse engine')
+
 		# Todo: implement the Greedy Search algorithm
 		# The first return is the path as sequence of tuples (as returned by the method construct_path())
 		# The second return is the cost of the path
@@ -180,7 +345,7 @@ class PathPlanner(object):
         # if no path to the goal was found
         return [], inf
 
-    def a_star(self, start_position, goal_position):
+    def a_star(self, start_position, goal_position, open_list='heap', stats=None, heuristic=None):
         """
         Plans a path using A*.
 
@@ -188,9 +353,21 @@ class PathPlanner(object):
         :type start_position: tuple.
         :param goal_position: goal position of the planning as a tuple (x, y).
         :type goal_position: tuple.
+        :param open_list: open list used by the array and sparse engines ('heap', 'radix' or 'indexed').
+        :type open_list: str.
+        :param stats: statistics filled in by the array and sparse engines, or None to disable them.
+        :type stats: SearchStats.
+        :param heuristic: heuristic used by the array and sparse engines instead of the euclidean distance, such
+            as a LandmarkHeuristic, or None.
+        :type heuristic: LandmarkHeuristic.
         :return: the path as a sequence of positions and the path cost.
         :rtype: list of tuples and float.
         """
+        if self.engine != 'node':
+            return self._search(start_position, goal_position, 1.0, 1.0, open_list, stats, heuristic)
+        if stats is not None or heuristic is not None:
+            raise ValueError('Search statistics and custom heuristics require the array or sparse engine')
+
 		# Todo: implement the A* algorithm
 		# The first return is the path as sequence of tuples (as returned by the method construct_path())
 		# The second return is the cost of the path
@@ -251,4 +428,459 @@ class PathPlanner(object):
                     heapq.heappush(pq, (exploring_node.f, exploring_node))
         
         # if no path to the goal was found
-        return [], inf
\ No newline at end of file
+        return [], inf
+
+    def jps(self, start_position, goal_position):
+        """
+        Plans a path using Jump Point Search (JPS), which is A* that prunes the symmetric paths of 8-connected grids.
+        Pruning is only valid where the cost is uniform, so JPS falls back to expanding every neighbor of cells
+        whose neighborhood has different costs, so the path cost matches the one of A* (up to floating point rounding).
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        if self.engine != 'array':
+            raise ValueError('Jump Point Search requires the array engine')
+        state = self.node_grid
+        state.reset()
+        if not self.cost_map.is_reachable(start_position, goal_position):
+            return [], inf
+        g = state.g
+        f = state.f
+        parent = state.parent
+        stamp = state.stamp
+        closed = state.closed
+        generation = state.generation
+        width = state.width
+        grid = self.cost_map.grid
+        graph = self.cost_map.get_graph()
+        uniform = graph.uniform
+        free_padded = graph.free
+        jump_distances = graph.get_jump_distances()
+        goal_i, goal_j = goal_position
+        start = state.get_index(start_position[0], start_position[1])
+        goal = state.get_index(goal_i, goal_j)
+
+        def free(i, j):
+            return free_padded[i + 1, j + 1]
+
+        def jump_straight(i, j, di, dj):
+            # Straight jumps are answered by the precomputed distances, except for the goal, which depends on the query
+            steps = int(jump_distances[(di, dj)][i, j])
+            if di == 0 and goal_i == i and 0 < (goal_j - j) * dj <= steps:
+                return goal_i, goal_j
+            if dj == 0 and goal_j == j and 0 < (goal_i - i) * di <= steps:
+                return goal_i, goal_j
+            i += steps * di
+            j += steps * dj
+            return (i, j) if free(i, j) else None
+
+        def jump(i, j, di, dj):
+            # Moves from (i, j) in the direction (di, dj) until a jump point is found
+            if di == 0 or dj == 0:
+                return jump_straight(i, j, di, dj)
+            while True:
+                i += di
+                j += dj
+                if not free(i, j):
+                    return None
+                if (i == goal_i and j == goal_j) or not uniform[i, j]:
+                    return i, j
+                if (not free(i - di, j) and free(i - di, j + dj)) or (not free(i, j - dj) and free(i + di, j - dj)):
+                    return i, j
+                if jump_straight(i, j, di, 0) is not None or jump_straight(i, j, 0, dj) is not None:
+                    return i, j
+
+        def get_directions(i, j, current):
+            # Directions left after pruning the neighbors of the cell (i, j) given its parent
+            if current == start or not uniform[i, j]:
+                return CostMapGraph.DIRECTIONS
+            parent_i, parent_j = divmod(int(parent[current]), width)
+            di = (i > parent_i) - (i < parent_i)
+            dj = (j > parent_j) - (j < parent_j)
+            if di != 0 and dj != 0:
+                directions = [(di, 0), (0, dj), (di, dj)]
+                if not free(i - di, j):
+                    directions.append((-di, dj))
+                if not free(i, j - dj):
+                    directions.append((di, -dj))
+            elif di != 0:
+                directions = [(di, 0)]
+                if not free(i, j + 1):
+                    directions.append((di, 1))
+                if not free(i, j - 1):
+                    directions.append((di, -1))
+            else:
+                directions = [(0, dj)]
+                if not free(i + 1, j):
+                    directions.append((1, dj))
+                if not free(i - 1, j):
+                    directions.append((-1, dj))
+            return directions
+
+        stamp[start] = generation
+        g[start] = 0.0
+        f[start] = sqrt((start_position[0] - goal_i) ** 2 + (start_position[1] - goal_j) ** 2)
+        parent[start] = -1
+        pq = [(f[start], start)]
+        while pq:
+            current_f, current = heapq.heappop(pq)
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            if current == goal:
+                return self.construct_jump_path(goal), float(g[goal])
+            i, j = divmod(current, width)
+            current_g = float(g[current])
+            for di, dj in get_directions(i, j, current):
+                jump_point = jump(i, j, di, dj)
+                if jump_point is None:
+                    continue
+                i_next, j_next = jump_point
+                successor = i_next * width + j_next
+                if closed[successor] == generation:
+                    continue
+                # Every cell crossed by a jump longer than one step has the same cost as the cell it started from
+                steps = max(abs(i_next - i), abs(j_next - j))
+                factor = sqrt(2) if di != 0 and dj != 0 else 1.0
+                new_g = current_g + factor * (grid[i, j] + grid[i_next, j_next]) / 2.0 if steps == 1 \
+                    else current_g + steps * factor * grid[i, j]
+                if stamp[successor] != generation or new_g < g[successor]:
+                    stamp[successor] = generation
+                    g[successor] = new_g
+                    f[successor] = new_g + sqrt((i_next - goal_i) ** 2 + (j_next - goal_j) ** 2)
+                    parent[successor] = current
+                    heapq.heappush(pq, (f[successor], successor))
+        # if no path to the goal was found
+        return [], inf
+
+    def construct_jump_path(self, goal_index):
+        """
+        Extracts the path after a Jump Point Search was executed, filling in the cells between the jump points.
+
+        :param goal_index: flat index of the cell where the goal was found.
+        :type goal_index: int.
+        :return: the path as a sequence of (x, y) positions: [(x1,y1),(x2,y2),(x3,y3),...,(xn,yn)].
+        :rtype: list of tuples.
+        """
+        jump_points = self.node_grid.construct_path(goal_index)
+        path = jump_points[:1]
+        for (i, j), (i_next, j_next) in zip(jump_points, jump_points[1:]):
+            di = (i_next > i) - (i_next < i)
+            dj = (j_next > j) - (j_next < j)
+            while (i, j) != (i_next, j_next):
+                i += di
+                j += dj
+                path.append((i, j))
+        return path
+
+    def _bidirectional_search(self, start_position, goal_position, use_heuristic, open_list='heap'):
+        """
+        Plans a path with two searches over the array-backed search states, one from the start and one from the
+        goal, which meet in the middle. Since get_edge_cost() is symmetric, the backward search uses the same graph.
+        With the heuristic, both searches use the average potential p(n) = (h_goal(n) - h_start(n)) / 2 with
+        opposite signs, which is consistent in both directions, so the Dijkstra stopping criterion still holds.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :param use_heuristic: if the searches are guided by the euclidean distances to the start and to the goal.
+        :type use_heuristic: bool.
+        :param open_list: open list used by the searches ('heap' or 'indexed').
+        :type open_list: str.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        if self.engine != 'array':
+            raise ValueError('Bidirectional search requires the array engine')
+        if open_list == 'radix':
+            raise ValueError('The radix heap requires non-negative priorities, which bidirectional A* does not have')
+        if self.backward_state is None:
+            self.backward_state = SearchState(self.cost_map)
+        states = [self.node_grid, self.backward_state]
+        for state in states:
+            state.reset()
+        if not self.cost_map.is_reachable(start_position, goal_position):
+            return [], inf
+        width = self.cost_map.width
+        graph = self.cost_map.get_graph()
+        offsets = graph.offsets
+        neighbors = graph.neighbors
+        costs = graph.costs
+        start_i, start_j = start_position
+        goal_i, goal_j = goal_position
+        roots = [start_i * width + start_j, goal_i * width + goal_j]
+
+        def potential(index):
+            # Potential of the forward search, whose opposite is the potential of the backward search
+            if not use_heuristic:
+                return 0.0
+            i, j = divmod(index, width)
+            return (sqrt((i - goal_i) ** 2 + (j - goal_j) ** 2) - sqrt((i - start_i) ** 2 + (j - start_j) ** 2)) / 2.0
+
+        open_lists = []
+        for side in range(2):
+            state = states[side]
+            state.stamp[roots[side]] = state.generation
+            state.g[roots[side]] = 0.0
+            state.parent[roots[side]] = -1
+            open_lists.append(OPEN_LISTS[open_list]())
+            open_lists[side].push((1 - 2 * side) * potential(roots[side]), roots[side])
+        # Cost of the best path found so far and the cell where its two halves meet
+        best_cost = 0.0 if roots[0] == roots[1] else inf
+        meeting = roots[0] if roots[0] == roots[1] else -1
+        while True:
+            # Any path through an open cell costs at least the sum of the lowest keys of both open lists
+            # (the potentials cancel out), so the best path is optimal once this sum reaches its cost
+            tops = []
+            for side in range(2):
+                pq = open_lists[side]
+                while pq and states[side].closed[pq.peek()[1]] == states[side].generation:
+                    pq.pop()
+                tops.append(pq.peek()[0] if pq else inf)
+            if tops[0] + tops[1] >= best_cost:
+                break
+            # Expanding the side with the smaller open list, which keeps the two searches balanced
+            side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+            sign = 1 - 2 * side
+            state = states[side]
+            other = states[1 - side]
+            g = state.g
+            stamp = state.stamp
+            closed = state.closed
+            generation = state.generation
+            key, current = open_lists[side].pop()
+            closed[current] = generation
+            current_g = float(g[current])
+            begin = offsets[current]
+            end = offsets[current + 1]
+            for successor, edge_cost in zip(neighbors[begin:end].tolist(), costs[begin:end].tolist()):
+                if closed[successor] == generation:
+                    continue
+                new_g = current_g + edge_cost
+                if stamp[successor] != generation or new_g < g[successor]:
+                    stamp[successor] = generation
+                    g[successor] = new_g
+                    state.parent[successor] = current
+                    open_lists[side].push(new_g + sign * potential(successor), successor)
+                    if other.stamp[successor] == other.generation and new_g + other.g[successor] < best_cost:
+                        best_cost = new_g + float(other.g[successor])
+                        meeting = successor
+        if meeting < 0:
+            # if no path to the goal was found
+            return [], inf
+        forward_path = states[0].construct_path(meeting)
+        backward_path = states[1].construct_path(meeting)
+        return forward_path + backward_path[-2::-1], best_cost
+
+    def bidirectional_dijkstra(self, start_position, goal_position, open_list='heap'):
+        """
+        Plans a path using the bidirectional Dijkstra algorithm, which grows two balls, around the start and
+        around the goal, whose radii are about half of the path cost.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :param open_list: open list used by the searches ('heap' or 'indexed').
+        :type open_list: str.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        return self._bidirectional_search(start_position, goal_position, False, open_list)
+
+    def bidirectional_a_star(self, start_position, goal_position, open_list='heap'):
+        """
+        Plans a path using bidirectional A*.
+
+        :param start_position: position where the planning stars as a tuple (x, y).
+        :type start_position: tuple.
+        :param goal_position: goal position of the planning as a tuple (x, y).
+        :type goal_position: tuple.
+        :param open_list: open list used by the searches ('heap' or 'indexed').
+        :type open_list: str.
+        :return: the path as a sequence of positions and the path cost.
+        :rtype: list of tuples and float.
+        """
+        return self._bidirectional_search(start_position, goal_position, True, open_list)
+
+    def _search_targets(self, root_position, target_positions):
+        """
+        Runs the Dijkstra algorithm from a root cell until every target cell is closed, so the search tree holds an
+        optimal path from the root to each target which can be reached.
+
+        :param root_position: position of the root as a tuple (x, y).
+        :type root_position: tuple.
+        :param target_positions: positions of the targets.
+        :type target_positions: list of tuples.
+        """
+        state = self.node_grid
+        state.reset()
+        g = state.g
+        parent = state.parent
+        stamp = state.stamp
+        closed = state.closed
+        generation = state.generation
+        get_successors = self.cost_map.get_graph().get_successor_lists
+        root = state.get_index(root_position[0], root_position[1])
+        remaining = set([state.get_index(i, j) for i, j in target_positions])
+        stamp[root] = generation
+        g[root] = 0.0
+        parent[root] = -1
+        pq = [(0.0, root)]
+        while pq and remaining:
+            current_g, current = heapq.heappop(pq)
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            remaining.discard(current)
+            successors, successor_costs = get_successors(current)
+            for successor, edge_cost in zip(successors, successor_costs):
+                if closed[successor] == generation:
+                    continue
+                new_g = current_g + edge_cost
+                if stamp[successor] != generation or new_g < g[successor]:
+                    stamp[successor] = generation
+                    g[successor] = new_g
+                    parent[successor] = current
+                    heapq.heappush(pq, (new_g, successor))
+
+    def group_pairs(self, pairs, algorithm):
+        """
+        Groups planning problems which share a start or a goal, greedily choosing the cell shared by most of the
+        problems not grouped yet. Since the edge costs are symmetric, a search rooted at a shared goal also solves
+        the problems of the group, whose paths are then reversed.
+
+        :param pairs: planning problems as (start position, goal position).
+        :type pairs: list of tuples.
+        :param algorithm: name of the planning algorithm.
+        :type algorithm: str.
+        :return: the groups as (root position, members), where each member is (number of the problem, the other
+            position of the problem, if the path must be reversed).
+        :rtype: list of tuples.
+        """
+        pairs = [(tuple(start_position), tuple(goal_position)) for start_position, goal_position in pairs]
+        if self.engine == 'node' or algorithm not in OPTIMAL_ALGORITHMS:
+            # Suboptimal algorithms would return different paths if their problems were solved by a shared search
+            return [(start_position, [(number, goal_position, False)])
+                    for number, (start_position, goal_position) in enumerate(pairs)]
+        # Problems which share each cell, as starts (side 0) or as goals (side 1)
+        sharing = {}
+        for number, pair in enumerate(pairs):
+            for side in range(2):
+                sharing.setdefault((pair[side], side), set()).add(number)
+        grouped = set()
+        groups = []
+        while len(grouped) < len(pairs):
+            (root, side), numbers = max(sharing.items(), key=lambda item: len(item[1]))
+            members = [(number, pairs[number][1 - side], side == 1) for number in sorted(numbers)]
+            groups.append((root, members))
+            for number in numbers:
+                grouped.add(number)
+                pair = pairs[number]
+                for other_side in range(2):
+                    key = (pair[other_side], other_side)
+                    if key != (root, side):
+                        sharing[key].discard(number)
+            del sharing[(root, side)]
+        return groups
+
+    def plan_groups(self, groups, algorithm):
+        """
+        Solves groups of planning problems, using one search for each group with many problems.
+
+        :param groups: the groups as returned by group_pairs().
+        :type groups: list of tuples.
+        :param algorithm: name of the planning algorithm used for groups with a single problem.
+        :type algorithm: str.
+        :return: the solutions as (number of the problem, path, cost).
+        :rtype: list of tuples.
+        """
+        results = []
+        for root, members in groups:
+            if len(members) < MIN_GROUP_SIZE:
+                for number, other, reverse in members:
+                    if reverse:
+                        path, cost = getattr(self, algorithm)(other, root)
+                    else:
+                        path, cost = getattr(self, algorithm)(root, other)
+                    results.append((number, path, cost))
+                continue
+            targets = [other for number, other, reverse in members if self.cost_map.is_reachable(root, other)]
+            if targets:
+                self._search_targets(root, targets)
+            state = self.node_grid
+            for number, other, reverse in members:
+                index = state.get_index(other[0], other[1])
+                if not targets or not state.is_closed(index):
+                    # if no path to the goal was found
+                    results.append((number, [], inf))
+                    continue
+                path = state.construct_path(index)
+                results.append((number, path[::-1] if reverse else path, state.get_g(index)))
+        return results
+
+    def plan_many(self, pairs, algorithm='a_star', processes=1):
+        """
+        Plans the paths of many planning problems, solving the problems which share a start or a goal with a
+        single search tree.
+
+        :param pairs: planning problems as (start position, goal position).
+        :type pairs: list of tuples.
+        :param algorithm: name of the planning algorithm ('dijkstra', 'greedy', 'a_star', ...). Groups are only
+            formed for optimal algorithms, whose costs do not change by sharing a search.
+        :type algorithm: str.
+        :param processes: number of worker processes among which the groups are split.
+        :type processes: int.
+        :return: the path and the path cost of each problem, in the same order as the problems.
+        :rtype: list of tuples.
+        """
+        groups = self.group_pairs(pairs, algorithm)
+        if processes > 1 and len(groups) > 1:
+            # Dealing the groups from the largest to the smallest, so every worker gets a similar amount of work
+            groups.sort(key=lambda group: len(group[1]), reverse=True)
+            shards = [(groups[k::processes], algorithm) for k in range(processes)]
+            with multiprocessing.Pool(processes, initializer=initialize_worker,
+                                      initargs=(self.cost_map, self.engine)) as pool:
+                results = [result for shard_results in pool.map(plan_shard, shards) for result in shard_results]
+        else:
+            results = self.plan_groups(groups, algorithm)
+        solutions = [None] * len(pairs)
+        for number, path, cost in results:
+            solutions[number] = (path, cost)
+        return solutions
+
+
+# Path planner of each worker process of plan_many(), created once by initialize_worker()
+worker_planner = None
+
+
+def initialize_worker(cost_map, engine):
+    """
+    Creates the path planner of a worker process of plan_many().
+
+    :param cost_map: cost map used for planning.
+    :type cost_map: CostMap.
+    :param engine: search state used by the planner.
+    :type engine: str.
+    """
+    global worker_planner
+    worker_planner = PathPlanner(cost_map, engine)
+
+
+def plan_shard(shard):
+    """
+    Solves the groups of planning problems assigned to a worker process of plan_many().
+
+    :param shard: the groups and the name of the planning algorithm.
+    :type shard: tuple.
+    :return: the solutions as (number of the problem, path, cost).
+    :rtype: list of tuples.
+    """
+    groups, algorithm = shard
+    return worker_planner.plan_groups(groups, algorithm)
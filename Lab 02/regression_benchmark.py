@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from math import inf
+from path_planner import PathPlanner
+from benchmark import create_cost_map, create_problems
+
+SIZES = ['160x120', '500x500', '1000x1000', '2000x2000']
+ALGORITHMS = ['dijkstra', 'greedy', 'a_star', 'jps', 'bidirectional_dijkstra', 'bidirectional_a_star']
+# Seeds are fixed so every run solves exactly the same problems
+MAP_SEED = 15
+PROBLEM_SEED = 0
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+# Multiple of the spread of the repeated timings which is attributed to timing noise regardless of the threshold
+TIME_NOISE = 3.0
+
+
+def measure(path_planner, algorithm, start_position, goal_position, repeats):
+    """
+    Solves a planning problem several times with a given algorithm.
+
+    :param path_planner: path planner of the map.
+    :type path_planner: PathPlanner.
+    :param algorithm: name of the PathPlanner method.
+    :type algorithm: str.
+    :param start_position: position where the planning stars as a tuple (x, y).
+    :type start_position: tuple.
+    :param goal_position: goal position of the planning as a tuple (x, y).
+    :type goal_position: tuple.
+    :param repeats: number of times the problem is solved.
+    :type repeats: int.
+    :return: the times of the repeats, the expansions and the cost of the path.
+    :rtype: list of float, int and float.
+    """
+    times = []
+    for _ in range(repeats):
+        tic = time.perf_counter()
+        path, cost = getattr(path_planner, algorithm)(start_position, goal_position)
+        times.append(time.perf_counter() - tic)
+    states = [path_planner.node_grid]
+    if algorithm.startswith('bidirectional'):
+        states.append(path_planner.backward_state)
+    expansions = sum([state.count_closed() for state in states])
+    return times, expansions, cost
+
+
+def run_size(size, algorithms, num_queries, repeats):
+    """
+    Measures the algorithms on the random map of a given size, with the obstacle density of main.py.
+
+    :param size: size of the map as '<width>x<height>'.
+    :type size: str.
+    :param algorithms: names of the PathPlanner methods.
+    :type algorithms: list of str.
+    :param num_queries: number of problems solved by each algorithm.
+    :type num_queries: int.
+    :param repeats: number of times each problem is solved.
+    :type repeats: int.
+    :return: time, spread of the time and expansions and cost of each problem of each algorithm, indexed by
+        '<size>/<algorithm>'.
+    :rtype: dict.
+    """
+    width, height = [int(value) for value in size.split('x')]
+    num_obstacles = round(20 * width * height / (160 * 120))
+    cost_map = create_cost_map(width, height, 20, 15, num_obstacles, MAP_SEED)
+    # Data shared by the queries is built beforehand, so it is not charged to the first one
+    cost_map.get_graph().get_jump_distances()
+    cost_map.get_components()
+    problems = create_problems(cost_map, num_queries, PROBLEM_SEED)
+    path_planner = PathPlanner(cost_map)
+    results = {}
+    for algorithm in algorithms:
+        measurements = [measure(path_planner, algorithm, start_position, goal_position, repeats)
+                        for start_position, goal_position in problems]
+        # The fastest repeat is the least disturbed by the rest of the system, and the distance to the median
+        # repeat measures how noisy the timing of each problem is
+        fastest = [min(times) for times, expansions, cost in measurements]
+        medians = [float(np.median(times)) for times, expansions, cost in measurements]
+        results['%s/%s' % (size, algorithm)] = {
+            'time': float(np.sum(fastest)),
+            'time_spread': float(np.sum(medians) - np.sum(fastest)),
+            'problems': [{'expansions': expansions, 'cost': float(cost) if cost != inf else None}
+                         for times, expansions, cost in measurements]}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the results with the baseline. The time of each algorithm is compared as a whole, while the expansions
+    and the cost are compared problem by problem.
+
+    :param results: time, spread of the time and expansions and cost of each problem of each benchmark.
+    :type results: dict.
+    :param baseline: results stored by a previous run.
+    :type baseline: dict.
+    :param threshold: relative increase of the time or of the expansions reported as a regression.
+    :type threshold: float.
+    :return: description of each regression.
+    :rtype: list of str.
+    """
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        current = results[name]
+        reference = baseline[name]
+        noise = TIME_NOISE * max(reference['time_spread'], current['time_spread'])
+        if current['time'] > reference['time'] * (1.0 + threshold) + noise:
+            regressions.append(r'{0}: time increased from {1} s to {2} s'.format(
+                name, reference['time'], current['time']))
+        if len(current['problems']) != len(reference['problems']):
+            regressions.append(r'{0}: number of problems changed from {1} to {2}'.format(
+                name, len(reference['problems']), len(current['problems'])))
+            continue
+        for number, (problem, reference_problem) in enumerate(zip(current['problems'], reference['problems'])):
+            if problem['expansions'] > reference_problem['expansions'] * (1.0 + threshold):
+                regressions.append(r'{0}: problem {1}: expansions increased from {2} to {3}'.format(
+                    name, number, reference_problem['expansions'], problem['expansions']))
+            cost = problem['cost']
+            reference_cost = reference_problem['cost']
+            if (cost is None) != (reference_cost is None) or \
+                    (cost is not None and abs(cost - reference_cost) > COST_TOLERANCE * reference_cost):
+                regressions.append(r'{0}: problem {1}: cost changed from {2} to {3}'.format(
+                    name, number, reference_cost, cost))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless regression benchmark of the path planners.')
+    parser.add_argument('--sizes', nargs='+', default=SIZES, help='map sizes as <width>x<height>')
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument('--queries', type=int, default=5, help='number of problems solved on each map')
+    parser.add_argument('--repeats', type=int, default=7, help='number of times each problem is solved')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative increase of the time or of the expansions reported as a regression')
+    parser.add_argument('--baseline', default='regression_baseline.json', help='file with the baseline results')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='stores the results as the new baseline instead of comparing with it')
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        results.update(run_size(size, args.algorithms, args.queries, args.repeats))
+    for name in sorted(results):
+        problems = results[name]['problems']
+        print(r'{0}: time: {1} s (spread: {2} s), expansions: total: {3}, solved: {4} of {5}'.format(
+            name, results[name]['time'], results[name]['time_spread'],
+            sum([problem['expansions'] for problem in problems]),
+            len([problem for problem in problems if problem['cost'] is not None]), len(problems)))
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        # Benchmarks which were not run keep their previous baseline
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(r'Baseline stored in {0}'.format(args.baseline))
+        return
+    with open(args.baseline) as file:
+        # Baselines stored before the results of each problem were kept can not be compared
+        baseline = {name: reference for name, reference in json.load(file).items() if 'problems' in reference}
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(r'REGRESSION: {0}'.format(regression))
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        print(r'No baseline for: {0} (rerun with --update-baseline to store it)'.format(', '.join(sorted(missing))))
+    if regressions:
+        sys.exit(1)
+    print('No regressions')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+import numpy as np
+import time
+
+
+class InstrumentedOpenList(object):
+    """
+    Represents an open list which counts the operations of another one on behalf of a SearchStats object.
+    """
+    def __init__(self, open_list, stats):
+        """
+        Wraps an open list.
+
+        :param open_list: the open list being measured.
+        :type open_list: HeapOpenList, RadixHeapOpenList or IndexedHeapOpenList.
+        :param stats: statistics updated by the operations.
+        :type stats: SearchStats.
+        """
+        self.open_list = open_list
+        self.stats = stats
+        # Cells in the order they were popped, only kept when the expansion order is recorded
+        self.popped = [] if stats.record_order else None
+
+    def push(self, priority, index):
+        """
+        Inserts a cell in the open list.
+
+        :param priority: priority of the cell (lower values are popped first).
+        :type priority: float.
+        :param index: flat index of the cell.
+        :type index: int.
+        """
+        self.open_list.push(priority, index)
+        self.stats.pushes += 1
+        size = len(self.open_list)
+        if size > self.stats.peak_open_size:
+            self.stats.peak_open_size = size
+
+    def pop(self):
+        """
+        Removes the cell with the lowest priority from the open list.
+
+        :return: priority and flat index of the cell.
+        :rtype: tuple.
+        """
+        entry = self.open_list.pop()
+        self.stats.pops += 1
+        if self.popped is not None:
+            self.popped.append(entry[1])
+        return entry
+
+    def __len__(self):
+        return len(self.open_list)
+
+
+class SearchStats(object):
+    """
+    Represents the statistics of a planner call. It is opt-in: a planner called without a SearchStats object
+    runs exactly the same code as before, so disabled statistics cost nothing.
+    """
+    def __init__(self, record_order=False):
+        """
+        Creates empty statistics.
+
+        :param record_order: if the order in which the cells are expanded is recorded.
+        :type record_order: bool.
+        """
+        self.record_order = record_order
+        self.clear()
+
+    def clear(self):
+        """
+        Clears the statistics. Planners call it at the beginning of each search.
+        """
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.peak_open_size = 0
+        self.reset_time = 0.0
+        self.expansion_time = 0.0
+        self.reconstruction_time = 0.0
+        self.expansion_order = None
+        self.tic = 0.0
+
+    def start(self):
+        """
+        Starts measuring a phase of the search.
+        """
+        self.tic = time.perf_counter()
+
+    def stop(self):
+        """
+        Finishes measuring a phase of the search.
+
+        :return: time elapsed since the phase started, in seconds.
+        :rtype: float.
+        """
+        return time.perf_counter() - self.tic
+
+    def instrument(self, open_list):
+        """
+        Wraps the open list of a search, so its operations are counted.
+
+        :param open_list: the open list used by the search.
+        :type open_list: HeapOpenList, RadixHeapOpenList or IndexedHeapOpenList.
+        :return: the instrumented open list.
+        :rtype: InstrumentedOpenList.
+        """
+        return InstrumentedOpenList(open_list, self)
+
+    def finish(self, open_list, state):
+        """
+        Computes the statistics which are derived from the search state once the search is over.
+
+        :param open_list: the instrumented open list used by the search.
+        :type open_list: InstrumentedOpenList.
+        :param state: search state of the planner.
+        :type state: SearchState.
+        """
+        # Every expansion closes exactly one cell, and every other pop found an outdated entry
+        self.expansions = state.count_closed()
+        self.stale_pops = self.pops - self.expansions
+        if self.record_order:
+            # A cell is expanded the first time it is popped, and skipped by the later pops
+            order = np.full(state.height * state.width, -1, dtype=np.int32)
+            popped = np.array(open_list.popped, dtype=np.int64)
+            cells, first_pops = np.unique(popped, return_index=True)
+            order[cells[np.argsort(first_pops)]] = np.arange(np.size(cells), dtype=np.int32)
+            self.expansion_order = order.reshape(state.height, state.width)
+
+    def get_expansion_order(self):
+        """
+        Obtains the per-cell expansion order of the last search.
+
+        :return: the rank in which each cell was expanded (-1 for cells which were not expanded).
+        :rtype: numpy array of shape (height, width).
+        """
+        if self.expansion_order is None:
+            raise ValueError('The expansion order was not recorded')
+        return self.expansion_order
+
+    def to_dict(self):
+        """
+        Obtains the counters and times as a dictionary.
+
+        :return: the statistics.
+        :rtype: dict.
+        """
+        return {'expansions': self.expansions, 'pushes': self.pushes, 'stale_pops': self.stale_pops,
+                'peak_open_size': self.peak_open_size, 'reset_time': self.reset_time,
+                'expansion_time': self.expansion_time, 'reconstruction_time': self.reconstruction_time}
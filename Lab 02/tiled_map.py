@@ -0,0 +1,395 @@
+from collections import OrderedDict
+from math import sqrt
+import json
+import numpy as np
+
+# Cost step of the quantized (uint8) files: code k means cost 1 + k * QUANTIZATION_STEP
+QUANTIZATION_STEP = 1.0 / 16.0
+# Code of the occupied cells in the quantized files
+OCCUPIED_CODE = 255
+
+
+class TiledCostMap(object):
+    """
+    Represents a cost map stored on disk as square tiles, which are read through a memory map and only decoded
+    when a planner touches them. It has the same interface as CostMap for planning, so it can be used by a
+    PathPlanner with the 'sparse' engine. The file holds either float32 costs (-1.0 for occupied cells) or uint8
+    codes, where a code k < 255 means cost 1 + k / 16 and 255 means occupied, so a file full of zeros is a map
+    of free cells with unit cost.
+    """
+    def __init__(self, filename, max_tiles=256, writable=False):
+        """
+        Opens a tiled cost map. The costs written to a quantized file must be representable as uint8 codes, that
+        is, multiples of 1 / 16 from 1 to 1 + 254 / 16 (about 16.9), otherwise writing them raises a ValueError
+        instead of silently clamping or rounding them.
+
+        :param filename: name of the file of the tiles (.npy), next to its description (.json).
+        :type filename: str.
+        :param max_tiles: maximum number of decoded tiles kept in memory (least recently used are discarded).
+        :type max_tiles: int.
+        :param writable: if the map may be edited, otherwise the file is opened read-only.
+        :type writable: bool.
+        """
+        with open(filename + '.json') as file:
+            description = json.load(file)
+        self.filename = filename
+        self.width = description['width']
+        self.height = description['height']
+        self.tile_size = description['tile_size']
+        # Shape (tile rows, tile columns, tile size, tile size), so each tile is contiguous on disk
+        self.tiles = np.load(filename, mmap_mode='r+' if writable else 'r')
+        self.writable = writable
+        self.quantized = self.tiles.dtype == np.uint8
+        self.max_tiles = max_tiles
+        # Decoded tiles indexed by (tile row, tile column), ordered from least to most recently used
+        self.cache = OrderedDict()
+        self.version = 0
+        self.graph = None
+        self.tiles_loaded = 0
+        self.touched_tiles = set()
+
+    @staticmethod
+    def create(filename, width, height, tile_size=256, quantize=True):
+        """
+        Creates a tiled cost map of free cells with unit cost.
+
+        :param filename: name of the file of the tiles (.npy), next to its description (.json).
+        :type filename: str.
+        :param width: width (number of columns) of the cost map.
+        :type width: int.
+        :param height: height (number of rows) of the cost map.
+        :type height: int.
+        :param tile_size: number of rows and columns of each tile.
+        :type tile_size: int.
+        :param quantize: if the costs are stored as uint8 codes instead of float32.
+        :type quantize: bool.
+        """
+        shape = (-(-height // tile_size), -(-width // tile_size), tile_size, tile_size)
+        tiles = np.lib.format.open_memmap(filename, mode='w+', dtype=np.uint8 if quantize else np.float32,
+                                          shape=shape)
+        # The quantized file is already filled with code 0 (unit cost), while the float32 one must be written
+        if not quantize:
+            for tile_row in tiles:
+                tile_row[...] = 1.0
+        tiles.flush()
+        del tiles
+        with open(filename + '.json', 'w') as file:
+            json.dump({'width': width, 'height': height, 'tile_size': tile_size}, file)
+
+    @staticmethod
+    def save(cost_map, filename, tile_size=256, quantize=True):
+        """
+        Saves an in-memory cost map as a tiled cost map.
+
+        :param cost_map: the cost map.
+        :type cost_map: CostMap.
+        :param filename: name of the file of the tiles (.npy), next to its description (.json).
+        :type filename: str.
+        :param tile_size: number of rows and columns of each tile.
+        :type tile_size: int.
+        :param quantize: if the costs are stored as uint8 codes instead of float32.
+        :type quantize: bool.
+        :return: the tiled cost map.
+        :rtype: TiledCostMap.
+        """
+        TiledCostMap.create(filename, cost_map.width, cost_map.height, tile_size, quantize)
+        tiled_map = TiledCostMap(filename, writable=True)
+        tiled_map.write_region(0, 0, cost_map.grid)
+        return tiled_map
+
+    def encode(self, costs):
+        """
+        Converts costs to the values stored in the file.
+
+        :param costs: the costs (negative for occupied cells).
+        :type costs: numpy array.
+        :return: the stored values.
+        :rtype: numpy array.
+        """
+        if not self.quantized:
+            return costs.astype(np.float32)
+        steps = (costs - 1.0) / QUANTIZATION_STEP
+        codes = np.rint(steps)
+        free = costs >= 0.0
+        invalid = free & ((codes < 0) | (codes > OCCUPIED_CODE - 1) | (np.abs(steps - codes) > 1e-6))
+        if np.any(invalid):
+            raise ValueError('Cost %s can not be stored as a uint8 code (multiples of %s from 1 to %s)'
+                             % (costs[invalid][0], QUANTIZATION_STEP, 1.0 + (OCCUPIED_CODE - 1) * QUANTIZATION_STEP))
+        return np.where(free, codes, OCCUPIED_CODE).astype(np.uint8)
+
+    def decode(self, values):
+        """
+        Converts the values stored in the file to costs.
+
+        :param values: the stored values.
+        :type values: numpy array.
+        :return: the costs (-1.0 for occupied cells).
+        :rtype: numpy array.
+        """
+        if not self.quantized:
+            return values.astype(np.float64)
+        return np.where(values == OCCUPIED_CODE, -1.0, 1.0 + QUANTIZATION_STEP * values)
+
+    def get_tile(self, tile_i, tile_j):
+        """
+        Obtains the decoded costs of a tile, reading it from disk only if it is not in memory.
+
+        :param tile_i: row of the tile.
+        :type tile_i: int.
+        :param tile_j: column of the tile.
+        :type tile_j: int.
+        :return: the costs of the cells of the tile.
+        :rtype: numpy array of shape (tile size, tile size).
+        """
+        key = (tile_i, tile_j)
+        tile = self.cache.get(key)
+        if tile is not None:
+            self.cache.move_to_end(key)
+            return tile
+        tile = self.decode(self.tiles[tile_i, tile_j])
+        self.tiles_loaded += 1
+        self.touched_tiles.add(key)
+        self.cache[key] = tile
+        if len(self.cache) > self.max_tiles:
+            self.cache.popitem(last=False)
+        return tile
+
+    def get_cell_cost(self, i, j):
+        """
+        Obtains the cost of a cell in the cost map.
+
+        :param i: the row (y coordinate) of the cell.
+        :type i: int.
+        :param j: the column (x coordinate) of the cell.
+        :type j: int.
+        :return: cost of the cell.
+        :rtype: float.
+        """
+        tile_size = self.tile_size
+        return self.get_tile(i // tile_size, j // tile_size)[i % tile_size, j % tile_size]
+
+    def get_edge_cost(self, start, end):
+        """
+        Obtains the cost of an edge.
+
+        :param start: the cell where the edge starts.
+        :type start: tuple.
+        :param end: the cell where the edge ends.
+        :type end: tuple.
+        :return: cost of the edge.
+        :rtype: float.
+        """
+        diagonal = (start[0] != end[0]) and (start[1] != end[1])
+        factor = sqrt(2) if diagonal else 1.0
+        return factor * (self.get_cell_cost(start[0], start[1]) + self.get_cell_cost(end[0], end[1])) / 2.0
+
+    def is_occupied(self, i, j):
+        """
+        Checks if a cell is occupied.
+
+        :param i: the row of the cell.
+        :type i: int.
+        :param j: the column of the cell.
+        :type j: int.
+        :return: True if the cell is occupied, False otherwise.
+        :rtype: bool.
+        """
+        return self.get_cell_cost(i, j) < 0.0
+
+    def is_index_valid(self, i, j):
+        """
+        Check if a (i,j) position is valid (is within the map boundaries).
+
+        :param i: the row of the cell.
+        :type i: int.
+        :param j: the column of the cell.
+        :type j: int.
+        :return: if the index is valid.
+        :rtype: bool.
+        """
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def is_reachable(self, start, goal):
+        """
+        Checks if a path may exist between two cells. The connected components of a map larger than the memory
+        are not labeled, so only paths to occupied cells are rejected.
+
+        :param start: the cell where the path starts.
+        :type start: tuple.
+        :param goal: the cell where the path ends.
+        :type goal: tuple.
+        :return: False if no path between the cells exists, True otherwise.
+        :rtype: bool.
+        """
+        return not self.is_occupied(goal[0], goal[1])
+
+    def get_graph(self):
+        """
+        Obtains the graph of this cost map, whose edges are computed from the tiles when they are needed.
+
+        :return: the graph of the map.
+        :rtype: TiledGraph.
+        """
+        if self.graph is None:
+            self.graph = TiledGraph(self)
+        return self.graph
+
+    def read_region(self, top, left, bottom, right):
+        """
+        Reads the costs of a rectangular region from disk, without keeping its tiles in memory.
+
+        :param top: row of the top left corner of the region.
+        :type top: int.
+        :param left: column of the top left corner of the region.
+        :type left: int.
+        :param bottom: row after the bottom right corner of the region.
+        :type bottom: int.
+        :param right: column after the bottom right corner of the region.
+        :type right: int.
+        :return: the costs of the region (-1.0 for occupied cells).
+        :rtype: numpy array of shape (bottom - top, right - left).
+        """
+        tile_size = self.tile_size
+        costs = np.empty((bottom - top, right - left))
+        for tile_i in range(top // tile_size, -(-bottom // tile_size)):
+            for tile_j in range(left // tile_size, -(-right // tile_size)):
+                row_begin = max(top, tile_i * tile_size)
+                row_end = min(bottom, (tile_i + 1) * tile_size)
+                column_begin = max(left, tile_j * tile_size)
+                column_end = min(right, (tile_j + 1) * tile_size)
+                values = self.tiles[tile_i, tile_j, row_begin - tile_i * tile_size:row_end - tile_i * tile_size,
+                                    column_begin - tile_j * tile_size:column_end - tile_j * tile_size]
+                costs[row_begin - top:row_end - top, column_begin - left:column_end - left] = self.decode(values)
+        return costs
+
+    def write_region(self, top, left, costs):
+        """
+        Writes the costs of a rectangular region to disk.
+
+        :param top: row of the top left corner of the region.
+        :type top: int.
+        :param left: column of the top left corner of the region.
+        :type left: int.
+        :param costs: the costs of the region (negative for occupied cells).
+        :type costs: numpy array of shape (rows, columns).
+        """
+        if not self.writable:
+            raise ValueError('The tiled cost map was opened read-only')
+        tile_size = self.tile_size
+        bottom = min(top + costs.shape[0], self.height)
+        right = min(left + costs.shape[1], self.width)
+        for tile_i in range(top // tile_size, -(-bottom // tile_size)):
+            for tile_j in range(left // tile_size, -(-right // tile_size)):
+                # Intersection of the region and the tile, in map coordinates
+                row_begin = max(top, tile_i * tile_size)
+                row_end = min(bottom, (tile_i + 1) * tile_size)
+                column_begin = max(left, tile_j * tile_size)
+                column_end = min(right, (tile_j + 1) * tile_size)
+                region = costs[row_begin - top:row_end - top, column_begin - left:column_end - left]
+                self.tiles[tile_i, tile_j, row_begin - tile_i * tile_size:row_end - tile_i * tile_size,
+                           column_begin - tile_j * tile_size:column_end - tile_j * tile_size] = self.encode(region)
+                self.cache.pop((tile_i, tile_j), None)
+        self.version += 1
+
+    def add_rectangle(self, rectangle, value):
+        """
+        Changes the values of a rectangular region to a given value, keeping the occupied cells.
+
+        :param rectangle: rectangular region defined as (x, y, width, height), where (x, y) is the top left corner.
+        :param value: the value used in the rectangular region.
+        """
+        top = min(max(int(rectangle[1]), 0), self.height)
+        left = min(max(int(rectangle[0]), 0), self.width)
+        bottom = min(max(int(rectangle[1] + rectangle[3]), top), self.height)
+        right = min(max(int(rectangle[0] + rectangle[2]), left), self.width)
+        if top == bottom or left == right:
+            return
+        region = self.read_region(top, left, bottom, right)
+        region[region >= 0.0] = value
+        self.write_region(top, left, region)
+
+    def add_obstacle(self, rectangle):
+        """
+        Adds an obstacle given a rectangular region (x, y, width, height).
+
+        :param rectangle: a rectangle defined as (x, y, width, height), where (x, y) is the top left corner.
+        :type rectangle: 4-dimensional tuple.
+        """
+        self.add_rectangle((rectangle[0] - 1, rectangle[1] - 1, rectangle[2] + 2, rectangle[3] + 2), 2.0)
+        self.add_rectangle(rectangle, -1.0)
+
+    def reset_counters(self):
+        """
+        Resets the counters of tiles loaded and touched.
+        """
+        self.tiles_loaded = 0
+        self.touched_tiles = set()
+
+    def flush(self):
+        """
+        Writes the pending changes to disk.
+        """
+        self.tiles.flush()
+
+
+class TiledGraph(object):
+    """
+    Represents the 8-connected graph of a tiled cost map, whose edges are computed when a cell is expanded,
+    so only the tiles around the search frontier are read.
+    """
+    # 8-connected neighborhood, in the same order used by NodeGrid.get_successors(), with the length of each step
+    DIRECTIONS = [(di, dj, sqrt(2) if di != 0 and dj != 0 else 1.0)
+                  for di in range(-1, 2) for dj in range(-1, 2) if di != 0 or dj != 0]
+
+    def __init__(self, cost_map):
+        """
+        Creates the graph of a tiled cost map.
+
+        :param cost_map: the tiled cost map.
+        :type cost_map: TiledCostMap.
+        """
+        self.cost_map = cost_map
+        self.width = cost_map.width
+        self.height = cost_map.height
+
+    def get_successor_lists(self, index):
+        """
+        Obtains the 8-connected successors of a cell and the costs of the edges to them.
+
+        :param index: flat index of the cell.
+        :type index: int.
+        :return: flat indices of the successors and costs of the edges.
+        :rtype: tuple of lists.
+        """
+        width = self.width
+        height = self.height
+        tile_size = self.cost_map.tile_size
+        get_tile = self.cost_map.get_tile
+        i, j = divmod(index, width)
+        tile_i, tile_j = i // tile_size, j // tile_size
+        tile = get_tile(tile_i, tile_j)
+        row = i - tile_i * tile_size
+        column = j - tile_j * tile_size
+        successors = []
+        costs = []
+        if 0 < row < tile_size - 1 and 0 < column < tile_size - 1 and 0 < i < height - 1 and 0 < j < width - 1:
+            # The whole neighborhood is inside the tile and the map, so it is read at once
+            block = tile[row - 1:row + 2, column - 1:column + 2].tolist()
+            cost = block[1][1]
+            for di, dj, factor in self.DIRECTIONS:
+                next_cost = block[1 + di][1 + dj]
+                if next_cost >= 0.0:
+                    successors.append(index + di * width + dj)
+                    costs.append(factor * (cost + next_cost) / 2.0)
+            return successors, costs
+        cost = float(tile[row, column])
+        for di, dj, factor in self.DIRECTIONS:
+            i_next = i + di
+            j_next = j + dj
+            if 0 <= i_next < height and 0 <= j_next < width:
+                next_cost = float(get_tile(i_next // tile_size, j_next // tile_size)[i_next % tile_size,
+                                                                                     j_next % tile_size])
+                if next_cost >= 0.0:
+                    successors.append(i_next * width + j_next)
+                    costs.append(factor * (cost + next_cost) / 2.0)
+        return successors, costs
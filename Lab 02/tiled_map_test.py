@@ -0,0 +1,64 @@
+import math
+import os
+import random
+import tempfile
+import numpy as np
+from benchmark import create_cost_map, create_problems
+from path_planner import PathPlanner
+from tiled_map import TiledCostMap
+
+NUM_MAPS = 2
+NUM_PROBLEMS = 5  # problems of each map, before and after it is edited
+TILE_SIZE = 32
+MAX_TILES = 6  # fewer than the 20 tiles of a map, so tiles are discarded and read again
+ALGORITHMS = ['dijkstra', 'a_star']
+# Relative difference of the path cost which is attributed to floating point rounding
+COST_TOLERANCE = 1e-6
+
+num_plans = 0
+with tempfile.TemporaryDirectory() as directory:
+    for seed in range(NUM_MAPS):
+        for quantize in [True, False]:
+            cost_map = create_cost_map(160, 120, 20, 15, 20, seed)
+            filename = os.path.join(directory, 'map_{0}_{1}.npy'.format(seed, int(quantize)))
+            TiledCostMap.save(cost_map, filename, TILE_SIZE, quantize).flush()
+            # Planning only needs to read the file
+            tiled_map = TiledCostMap(filename, MAX_TILES)
+            assert np.array_equal(tiled_map.read_region(0, 0, cost_map.height, cost_map.width), cost_map.grid)
+            try:
+                tiled_map.add_obstacle((0, 0, 1, 1))
+                assert False, 'a read-only map was edited'
+            except ValueError:
+                pass
+            for edited in [False, True]:
+                if edited:
+                    # The same obstacles are added to both maps
+                    tiled_map = TiledCostMap(filename, MAX_TILES, writable=True)
+                    rng = random.Random(seed)
+                    for obstacle in range(5):
+                        rectangle = (rng.randint(0, cost_map.width - 1), rng.randint(0, cost_map.height - 1), 20, 15)
+                        cost_map.add_obstacle(rectangle)
+                        tiled_map.add_obstacle(rectangle)
+                path_planner = PathPlanner(cost_map)
+                tiled_planner = PathPlanner(tiled_map, engine='sparse')
+                for start_position, goal_position in create_problems(cost_map, NUM_PROBLEMS, seed):
+                    expected_path, expected_cost = path_planner.dijkstra(start_position, goal_position)
+                    for algorithm in ALGORITHMS:
+                        path, cost = getattr(tiled_planner, algorithm)(start_position, goal_position)
+                        assert math.isclose(cost, expected_cost, rel_tol=COST_TOLERANCE), (
+                            algorithm, quantize, edited, start_position, goal_position, cost, expected_cost)
+                        if path:
+                            assert path[0] == tuple(start_position) and path[-1] == tuple(goal_position)
+                            path_cost = sum([cost_map.get_edge_cost(path[k], path[k + 1])
+                                             for k in range(len(path) - 1)])
+                            assert math.isclose(path_cost, cost, rel_tol=COST_TOLERANCE), (path_cost, cost)
+                        num_plans += 1
+            if quantize:
+                # Costs which are not multiples of the quantization step from 1 on are rejected
+                for value in [0.5, 1.01, 100.0]:
+                    try:
+                        tiled_map.write_region(0, 0, np.full((1, 1), value))
+                        assert False, 'cost {0} was quantized'.format(value)
+                    except ValueError:
+                        pass
+print(r'Planning on tiled maps matches Dijkstra on the in-memory maps in {0} plans'.format(num_plans))